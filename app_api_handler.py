@@ -4,7 +4,7 @@ ESP32 → 서버 → 앱 데이터 전달을 위한 API 엔드포인트들
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
 import asyncio
@@ -59,19 +59,15 @@ class AppApiHandler:
         self.router.add_api_route("/ping", self.app_ping, methods=["GET"])
         self.router.add_api_route("/status", self.get_app_status, methods=["GET"])
 
-        # 🔥 새로운 JPG 직접 전송 라우트 추가
-        self.router.add_api_route("/images/latest.jpg", self.get_latest_image_jpg, methods=["GET"])
-        self.router.add_api_route("/images/{image_id}.jpg", self.get_image_by_id_jpg, methods=["GET"])
-        
-        # 기존 Base64 방식도 유지 (하위 호환성)
-        self.router.add_api_route("/images/latest", self.get_latest_image, methods=["GET"])
-
     async def websocket_stream(self, websocket: WebSocket):
         """앱에서 실시간 데이터를 받기 위한 WebSocket 연결"""
         client_id = None
         try:
             # WebSocket 연결 및 클라이언트 ID 생성
             client_id = await self.websocket_manager.connect(websocket, "mobile_app")
+            if client_id is None:
+                # 연결 상한 초과로 거부됨
+                return
             print(f"📱 앱 클라이언트 연결됨: {client_id}")
         
             # 연결 즉시 현재 상태 + 시간 정보 전송
@@ -1,9 +1,46 @@
 # esp32_handler.py 
 import asyncio
+import binascii
 import json
+import time
 import aiohttp
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from logging_setup import logger
+
+# 중복 이미지 판별용 해시 (xxhash 사용 가능 시 우선 사용)
+try:
+    import xxhash
+
+    def image_digest(image: str) -> int:
+        # xxhash 4.x는 str을 받지 않으므로 항상 bytes로 해시
+        return xxhash.xxh3_64_intdigest(image.encode())
+except ImportError:
+    import zlib
+
+    def image_digest(image: str) -> int:
+        return zlib.crc32(image.encode())
+
+# 같은 이미지가 계속 들어올 때 최신 이미지 키의 TTL을 연장하는 주기 (redis_manager.IMAGE_TTL 600초의 절반)
+IMAGE_TTL_REFRESH_INTERVAL = 300
+
+def decode_image(image: str) -> Tuple[str, bytes]:
+    """ESP32가 보낸 base64 이미지를 정리하고 JPEG 바이트로 한 번만 디코딩
+
+    (정리된 base64 문자열, 디코딩된 바이트)를 반환하며, 잘못된 데이터면 binascii.Error 발생
+    """
+    # 공백/줄바꿈 제거
+    clean_image = image.replace(" ", "").replace("\n", "").replace("\r", "").strip()
+    
+    # data:image/jpeg;base64, 접두사 제거 (있다면)
+    if clean_image.startswith("data:"):
+        clean_image = clean_image.split(",", 1)[-1]
+    
+    return clean_image, binascii.a2b_base64(clean_image)
+
+def encode_image(jpg: bytes) -> Tuple[str, bytes]:
+    """원본 JPEG 바이트를 decode_image()와 같은 (base64 문자열, 바이트) 형태로 변환"""
+    return binascii.b2a_base64(jpg, newline=False).decode("ascii"), jpg
 
 def get_korea_time():
     """한국 시간 반환"""
@@ -29,33 +66,52 @@ class ESP32Handler:
         # 전체 상태
         self.last_heartbeat = None
         
+        # 직전 이미지 해시 (같은 JPEG 재전송 시 디코딩/저장 생략)
+        self._last_image_digest = None
+        self._last_image_refresh = 0.0  # 최신 이미지 키를 마지막으로 저장/TTL 연장한 시각 (monotonic)
+        
         print("🔧 ESP32Handler 초기화 완료 (POST 수신 모드)")
     
-    def update_device_status(self, device_type: str, client_ip: str):
-        """디바이스 상태 업데이트"""
-        current_time = get_korea_time().isoformat()
+    def is_unchanged_image(self, digest: int) -> bool:
+        """직전에 저장한 이미지와 같은 해시인지 (수신 지점에서 디코딩/브로드캐스트 전에 확인)"""
+        return digest == self._last_image_digest
+    
+    def image_decode_error(self, error: Exception) -> Dict[str, Any]:
+        """base64 디코딩 실패 결과 (이전 이미지를 그대로 유지하므로 저장하지 않음)"""
+        return {
+            "status": "error",
+            "message": f"ESP Eye 이미지 디코딩 실패: {error}",
+            "device_type": "esp_eye",
+            "timestamp": get_korea_time().isoformat()
+        }
+    
+    def update_device_status(self, device_type: str, client_ip: str, current_time: Optional[str] = None):
+        """디바이스 상태 업데이트 (current_time이 주어지면 시각을 다시 계산하지 않음)"""
+        if current_time is None:
+            current_time = get_korea_time().isoformat()
         
         if device_type == "esp32":
             self.esp32_ip = client_ip
             self.esp32_status = "connected"
             self.esp32_last_seen = current_time
-            print(f"📡 ESP32 상태 업데이트: {client_ip}")
+            logger.debug("📡 ESP32 상태 업데이트: %s", client_ip)
         elif device_type == "esp_eye":
             self.esp_eye_ip = client_ip
             self.esp_eye_status = "connected"
             self.esp_eye_last_seen = current_time
-            print(f"👁️ ESP Eye 상태 업데이트: {client_ip}")
+            logger.debug("👁️ ESP Eye 상태 업데이트: %s", client_ip)
         
         self.last_heartbeat = current_time
     
     def process_esp32_sensor_data(self, raw_data: Dict[str, Any], client_ip: str) -> Dict[str, Any]:
         """ESP32 센서 데이터 처리"""
         
-        # 디바이스 상태 업데이트
-        self.update_device_status("esp32", client_ip)
-        
+        # 요청당 한 번만 시각을 계산해 상태/데이터에 함께 사용
         timestamp = get_korea_time().isoformat()
         
+        # 디바이스 상태 업데이트
+        self.update_device_status("esp32", client_ip, timestamp)
+        
         # ESP32 센서 데이터 정규화
         processed_data = {
             "device_type": "esp32",
@@ -142,11 +198,12 @@ class ESP32Handler:
     def process_esp_eye_data(self, raw_data: Dict[str, Any], client_ip: str) -> Dict[str, Any]:
         """ESP Eye 이미지 데이터 처리 (단순화 버전)"""
         
-        # 디바이스 상태 업데이트
-        self.update_device_status("esp_eye", client_ip)
-        
+        # 요청당 한 번만 시각을 계산해 상태/데이터에 함께 사용
         timestamp = get_korea_time().isoformat()
         
+        # 디바이스 상태 업데이트
+        self.update_device_status("esp_eye", client_ip, timestamp)
+        
         # ESP Eye 데이터 정규화 (이미지만)
         processed_data = {
             "device_type": "esp_eye",
@@ -209,18 +266,22 @@ class ESP32Handler:
             # 1. 데이터 처리
             processed_data = self.process_esp32_sensor_data(raw_data, client_ip)
             
-            print(f"📡 ESP32 데이터: 온도={processed_data['temperature']}°C, "
-                  f"습도={processed_data['humidity']}%, 알림레벨={processed_data['alert_level']}")
+            logger.debug("📡 ESP32 데이터: 온도=%s°C, 습도=%s%%, 알림레벨=%s",
+                         processed_data['temperature'], processed_data['humidity'], processed_data['alert_level'])
+            
+            # 표시용 한국 시간 문자열 (브로드캐스트/응답에서 재사용)
+            korea_time = datetime.fromisoformat(processed_data["timestamp"]).strftime("%Y년 %m월 %d일 %H:%M:%S")
             
             # 2. Redis 저장
             redis_stored = False
             if self.redis_manager and hasattr(self.redis_manager, 'store_esp32_data'):
                 try:
-                    redis_stored = self.redis_manager.store_esp32_data(processed_data)
+                    # 동기 Redis 호출은 이벤트 루프를 막지 않도록 스레드에서 실행
+                    redis_stored = await asyncio.to_thread(self.redis_manager.store_esp32_data, processed_data)
                 except Exception as e:
-                    print(f"⚠️ Redis 저장 실패: {e}")
+                    logger.warning("⚠️ Redis 저장 실패: %s", e)
             
-            # 3. 실시간 앱 전송
+            # 3. 실시간 앱 전송 (앱이 처리하는 개별 esp32_sensor_data 메시지 그대로 - 배치 큐로 묶지 않음)
             apps_notified = 0
             if self.websocket_manager and hasattr(self.websocket_manager, 'broadcast_to_apps'):
                 try:
@@ -228,19 +289,19 @@ class ESP32Handler:
                         "type": "esp32_sensor_data",
                         "source": "esp32",
                         "data": processed_data,
-                        "korea_time": get_korea_time().strftime("%Y년 %m월 %d일 %H:%M:%S"),
+                        "korea_time": korea_time,
                         "timestamp": processed_data["timestamp"]
                     }
                     apps_notified = await self.websocket_manager.broadcast_to_apps(app_data)
                 except Exception as e:
-                    print(f"⚠️ 앱 브로드캐스트 실패: {e}")
+                    logger.warning("⚠️ 앱 브로드캐스트 실패: %s", e)
             
             return {
                 "status": "success",
                 "message": "ESP32 센서 데이터 처리 완료",
                 "device_type": "esp32",
                 "timestamp": processed_data["timestamp"],
-                "korea_time": get_korea_time().strftime("%Y년 %m월 %d일 %H:%M:%S"),
+                "korea_time": korea_time,
                 "processing_results": {
                     "redis_stored": redis_stored,
                     "apps_notified": apps_notified,
@@ -249,7 +310,7 @@ class ESP32Handler:
             }
             
         except Exception as e:
-            print(f"❌ ESP32 데이터 처리 오류: {e}")
+            logger.error("❌ ESP32 데이터 처리 오류: %s", e)
             return {
                 "status": "error",
                 "message": f"ESP32 데이터 처리 실패: {str(e)}",
@@ -257,45 +318,58 @@ class ESP32Handler:
                 "timestamp": get_korea_time().isoformat()
             }
 
-    async def handle_esp_eye_data(self, raw_data: Dict[str, Any], client_ip: str = "unknown") -> Dict[str, Any]:
-        """ESP Eye 이미지 데이터 처리 파이프라인"""
+    async def handle_esp_eye_data(self, raw_data: Dict[str, Any], client_ip: str = "unknown",
+                                  decoded: Optional[Tuple[str, bytes]] = None,
+                                  digest: Optional[int] = None) -> Dict[str, Any]:
+        """ESP Eye 이미지 데이터 처리 파이프라인
+
+        decoded: 수신 지점에서 decode_image()로 이미 디코딩한 결과 (있으면 다시 디코딩하지 않음)
+        digest: 수신 지점에서 이미 계산한 image_digest() 값 (있으면 다시 해시하지 않음)
+        """
     
         try:
             # 1. 데이터 처리
             processed_data = self.process_esp_eye_data(raw_data, client_ip)
         
-            print(f"👁️ ESP Eye 데이터: 이미지크기={processed_data['image_size']}bytes")
+            logger.debug("👁️ ESP Eye 데이터: 이미지크기=%sbytes", processed_data['image_size'])
         
-            # 🔥 2. Base64 데이터 정리 및 검증
             raw_image = raw_data.get("image", "")
+            
+            # 직전과 같은 이미지면 디코딩/저장 생략 (하트비트 재전송)
+            if digest is None:
+                digest = image_digest(raw_image)
+            if raw_image and self.is_unchanged_image(digest):
+                logger.debug("👁️ 이전과 동일한 이미지 - 처리 생략")
+                # 저장은 생략해도 카메라가 보내는 동안 이미지 키가 만료되지 않도록 TTL 절반마다 연장
+                now = time.monotonic()
+                if now - self._last_image_refresh >= IMAGE_TTL_REFRESH_INTERVAL and hasattr(self.redis_manager, 'refresh_image_ttl'):
+                    self._last_image_refresh = now
+                    await asyncio.to_thread(self.redis_manager.refresh_image_ttl)
+                return {
+                    "status": "success",
+                    "message": "ESP Eye 이미지 변경 없음",
+                    "device_type": "esp_eye",
+                    "timestamp": processed_data["timestamp"],
+                    "processing_results": {
+                        "image_stored": False,
+                        "image_unchanged": True,
+                        "image_size": len(raw_image)
+                    }
+                }
         
-            # Base64 데이터 정리 (공백, 줄바꿈 제거)
-            clean_image = raw_image.replace(" ", "").replace("\n", "").replace("\r", "").strip()
-        
-            # data:image/jpeg;base64, 접두사 제거 (있다면)
-            if clean_image.startswith("data:"):
-                clean_image = clean_image.split(",", 1)[-1]
-        
-            print(f"🔍 원본 이미지 길이: {len(raw_image)}")
-            print(f"🔍 정리된 이미지 길이: {len(clean_image)}")
-            print(f"🔍 이미지 시작: {clean_image[:30]}...")
-        
-            # 3. Base64 유효성 검사
+            # 🔥 2. Base64 정리 및 디코딩 (수신 지점에서 이미 했다면 재사용)
             try:
-                import base64
-                # Base64 디코딩 테스트
-                decoded_data = base64.b64decode(clean_image)
-                print(f"✅ Base64 디코딩 성공: {len(decoded_data)} bytes")
+                clean_image, decoded_data = decoded if decoded else decode_image(raw_image)
+                logger.debug("✅ Base64 디코딩 성공: %d bytes", len(decoded_data))
             
                 # JPEG 헤더 확인
-                if decoded_data.startswith(b'\xff\xd8\xff'):
-                    print("✅ JPEG 이미지 확인됨")
-                else:
-                    print("⚠️ JPEG 헤더가 아님")
+                if not decoded_data.startswith(b'\xff\xd8\xff'):
+                    logger.warning("⚠️ JPEG 헤더가 아님")
                 
-            except Exception as decode_error:
-                print(f"❌ Base64 디코딩 실패: {decode_error}")
-                clean_image = ""  # 잘못된 데이터면 빈 문자열로
+            except (binascii.Error, ValueError) as decode_error:
+                logger.error("❌ Base64 디코딩 실패: %s", decode_error)
+                # 잘못된 데이터면 저장하지 않고 이전 이미지를 그대로 유지
+                return self.image_decode_error(decode_error)
         
             # 4. Redis에 이미지 데이터 저장
             image_stored = False
@@ -311,13 +385,16 @@ class ESP32Handler:
                             "height": processed_data["image_height"],
                             "format": "jpeg",
                             "size": len(clean_image),
-                            "decoded_size": len(decoded_data) if 'decoded_data' in locals() else 0
+                            "decoded_size": len(decoded_data)
                         }
                     }
-                    image_stored = self.redis_manager.store_image_data(image_data)
-                    print(f"✅ 이미지 Redis 저장: {image_stored}")
+                    image_stored = await asyncio.to_thread(self.redis_manager.store_image_data, image_data, decoded_data)
+                    if image_stored:
+                        self._last_image_digest = digest
+                        self._last_image_refresh = time.monotonic()
+                    logger.debug("✅ 이미지 Redis 저장: %s", image_stored)
                 except Exception as e:
-                    print(f"⚠️ 이미지 저장 실패: {e}")
+                    logger.warning("⚠️ 이미지 저장 실패: %s", e)
         
             # 나머지 코드는 동일...
             return {
@@ -333,7 +410,7 @@ class ESP32Handler:
             }
         
         except Exception as e:
-            print(f"❌ ESP Eye 데이터 처리 오류: {e}")
+            logger.error("❌ ESP Eye 데이터 처리 오류: %s", e)
             return {
                 "status": "error",
                 "message": f"ESP Eye 데이터 처리 실패: {str(e)}",
@@ -0,0 +1,38 @@
+"""
+로깅 설정 - 요청 처리 경로에서 stdout 쓰기를 하지 않도록 QueueHandler 사용
+"""
+
+import logging
+import logging.handlers
+import queue
+
+_log_queue = queue.Queue(-1)
+_listener = None
+
+def setup_logging() -> logging.Logger:
+    """babymon 로거 설정 (포맷/출력은 별도 리스너 스레드에서 처리)"""
+    global _listener
+    
+    logger = logging.getLogger("babymon")
+    if _listener is not None:
+        return logger
+    
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    logger.propagate = False
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    
+    _listener = logging.handlers.QueueListener(_log_queue, stream_handler)
+    _listener.start()
+    return logger
+
+def stop_logging():
+    """리스너 스레드 종료 (남은 로그 모두 출력)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+logger = setup_logging()
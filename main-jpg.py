@@ -94,7 +94,7 @@ async def receive_esp32_data(request: Request, data: Dict[str, Any]):
             "status": "fallback_mode",
             "message": "Modules not available - running in basic mode",
             "data_received": {
-                "size": len(str(data)),
+                "size": len(await request.body()),  # 전체 dict를 문자열로 만들지 않고 요청 본문 길이 사용 (main.py와 동일)
                 "has_image": "image" in data,
                 "has_sensor": any(key in data for key in ["temperature", "humidity", "movement", "sound"])
             }
@@ -1,31 +1,106 @@
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse 
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response, ORJSONResponse
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 import asyncio
 import json
+from collections import deque
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from app_api_handler import AppApiHandler
 from realtime_handler import RealTimeHandler
+from logging_setup import logger, stop_logging
 from datetime import datetime, timezone, timedelta
 import pytz
-import queue  
-import threading  
 import time 
 import base64
+import io
+import binascii
+import gzip
+import hashlib
+import struct
+import zlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# JSON 파싱/응답 (orjson 사용 가능 시 우선 사용)
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+    DefaultJSONResponse = ORJSONResponse
+except ImportError:
+    json_loads = json.loads
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode()
+    DefaultJSONResponse = JSONResponse
+
+def static_json_prefix(static: Dict[str, Any]) -> bytes:
+    """고정 필드를 미리 직렬화 (닫는 괄호 제외 - static_json_response에서 이어 붙임)"""
+    return json_dumps(static)[:-1]
+
+def static_json_body(prefix: bytes, dynamic: Dict[str, Any]) -> bytes:
+    """미리 직렬화한 고정 필드 뒤에 요청마다 바뀌는 필드만 직렬화해 붙인 JSON 본문"""
+    return prefix + b"," + json_dumps(dynamic)[1:]
+
+class ORJSONRequest(Request):
+    """요청 본문 JSON 파싱을 json_loads(orjson)로 처리하는 Request"""
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = json_loads(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """Dict 본문을 받는 라우트도 orjson으로 파싱하도록 Request 클래스 교체"""
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            return await original_handler(ORJSONRequest(request.scope, request.receive))
+        
+        return route_handler
 
 KST = pytz.timezone('Asia/Seoul')
 
+# 고정 오프셋 한국 시간대 (호출마다 timedelta/timezone 객체를 만들지 않음)
+KOREA_TZ = timezone(timedelta(hours=9))
+
 def get_korea_time():
     """한국 시간을 반환"""
-    utc_now = datetime.now(timezone.utc)
-    korea_offset = timedelta(hours=9)
-    korea_tz = timezone(korea_offset)
-    return utc_now.astimezone(korea_tz)
+    return datetime.now(KOREA_TZ)
+
+# 서버 시작 시각 (요청마다 다시 포맷하지 않음)
+SERVER_STARTED_AT = datetime.now().isoformat()
+
+# 초 단위 UTC 타임스탬프 캐시 [초, ISO 문자열] - 같은 초 안에서는 문자열 재사용
+_timestamp_cache = [0, ""]
+
+def current_timestamp() -> str:
+    """현재 UTC ISO 타임스탬프 (1초 해상도로 캐시)"""
+    sec = int(time.time())
+    if sec != _timestamp_cache[0]:
+        _timestamp_cache[0] = sec
+        _timestamp_cache[1] = datetime.fromtimestamp(sec, timezone.utc).isoformat()
+    return _timestamp_cache[1]
+
+# 초 단위 한국 시간 타임스탬프 캐시 [초, ISO 문자열]
+_korea_timestamp_cache = [0, ""]
+
+def current_korea_timestamp() -> str:
+    """현재 한국 시간 ISO 타임스탬프 (1초 해상도로 캐시)"""
+    sec = int(time.time())
+    if sec != _korea_timestamp_cache[0]:
+        _korea_timestamp_cache[0] = sec
+        _korea_timestamp_cache[1] = datetime.fromtimestamp(sec, KST).isoformat()
+    return _korea_timestamp_cache[1]
 
 try:
     from redis_manager import RedisManager
-    from esp32_handler import ESP32Handler
+    from esp32_handler import ESP32Handler, decode_image, encode_image, image_digest
     from websocket_manager import WebSocketManager
     from image_handler import ImageHandler
     MODULES_AVAILABLE = True
@@ -39,37 +114,113 @@ except ImportError as e:
 app = FastAPI(
     title="Baby Monitor Server",
     description="ESP32-CAM과 모바일 앱을 연결하는 중계 서버",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=DefaultJSONResponse
+)
+app.router.route_class = ORJSONRoute  # 라우트 등록 전에 설정해야 적용됨
+
+# 정적 파일 (Bootstrap 등 CDN 자산 자체 호스팅 - static/vendor/)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+VENDOR_DIR = os.path.join(STATIC_DIR, "vendor")
+
+# CDN 주소 -> static/vendor/ 파일 이름 후보 (앞쪽 우선, 1년 캐시)
+# *.purged.css는 scripts/build_vendor_css.sh로 페이지에서 쓰는 클래스만 남긴 빌드
+VENDOR_ASSETS = {
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css": (
+        "bootstrap-5.1.3.purged.css", "bootstrap-5.1.3.min.css"),
+    "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.7.2/font/bootstrap-icons.css": (
+        "bootstrap-icons-1.7.2.purged.css", "bootstrap-icons-1.7.2.css"),
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js": (
+        "bootstrap-5.1.3.bundle.min.js",),
+}
+
+class ImmutableStaticFiles(StaticFiles):
+    """버전이 고정된 정적 파일 (ETag/Last-Modified 304 응답은 StaticFiles가 처리)"""
+    
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+if os.path.isdir(STATIC_DIR):
+    app.mount("/static", ImmutableStaticFiles(directory=STATIC_DIR), name="static")
+
+def vendor_asset_url(names) -> Optional[str]:
+    """static/vendor/에 있는 첫 번째 후보의 주소 (purged 빌드는 다시 만들면 내용이 바뀌므로 내용 해시를 붙임)"""
+    for name in names:
+        path = os.path.join(VENDOR_DIR, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                version = hashlib.sha1(f.read()).hexdigest()[:8]
+            return f"/static/vendor/{name}?v={version}"
+    return None
+
+# static/vendor/에 실제로 있는 파일만 교체 대상 (없으면 기존 CDN 주소 유지)
+VENDOR_REPLACEMENTS = [
+    (cdn_url.encode(), local_url.encode())
+    for cdn_url, local_url in ((cdn_url, vendor_asset_url(names)) for cdn_url, names in VENDOR_ASSETS.items())
+    if local_url
+]
+
+# HTML 페이지 템플릿 (templates/ 디렉터리)
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+page_templates = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
 )
 
+def load_static_fragment(name: str) -> bytes:
+    """렌더링이 필요 없는 정적 HTML 조각을 UTF-8 bytes로 미리 읽어둠"""
+    with open(os.path.join(TEMPLATES_DIR, name), encoding="utf-8") as f:
+        return f.read().encode("utf-8")
+
+def static_html_response(request: Request, html: bytes, html_gz: bytes, headers: Dict[str, str] = None) -> Response:
+    """import 시 미리 압축해 둔 정적 HTML 응답 (gzip 미지원 클라이언트에는 원본 그대로)"""
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=html_gz, media_type="text/html", headers=headers)
+    return HTMLResponse(content=html, headers=headers)
+
+# CDN preconnect 힌트 (안내 주석 포함) - 페이지에 CDN 주소가 남지 않으면 함께 제거
+CDN_PRECONNECT_RE = re.compile((
+    r'[ \t]*<!-- CDN 연결 미리 준비[^\n]*-->\n'
+    r'|[ \t]*<link rel="preconnect" href="https://cdn\.jsdelivr\.net"(?: crossorigin)?>\n'
+).encode())
+
+def localize_vendor_assets(html: bytes) -> bytes:
+    """미리 인코딩한 페이지의 CDN 주소를 자체 호스팅 주소로 교체 (시작 시 페이지마다 한 번)
+
+    모든 CDN 주소가 교체되면 더 이상 필요 없는 cdn.jsdelivr.net preconnect 힌트도 제거
+    """
+    for cdn_url, local_url in VENDOR_REPLACEMENTS:
+        html = html.replace(cdn_url, local_url)
+    if b"https://cdn.jsdelivr.net/" not in html:
+        html = CDN_PRECONNECT_RE.sub(b"", html)
+    return html
+
 # 🔥 수정: 매니저들을 한 번만 초기화
 if MODULES_AVAILABLE:
     try:
-        # Redis 연결 재시도 로직 추가
-        print("🔍 Redis 연결 시도...")
-        redis_manager = RedisManager()
-        
-        # Redis 연결 실패 시 재시도 (Railway 일시적 문제 대응)
-        if not redis_manager.available:
-            print("⚠️ Redis 첫 연결 실패 - 3초 후 재시도...")
-            import time
-            time.sleep(3)
-            redis_manager = RedisManager()  # 재시도
-            
-        if not redis_manager.available:
+        # Redis 연결 (실패 시 한 번 재시도 - Railway 일시적 문제 대응)
+        for attempt in range(2):
+            if attempt:
+                print("⚠️ Redis 첫 연결 실패 - 3초 후 재시도...")
+                time.sleep(3)
+            print("🔍 Redis 연결 시도...")
+            redis_manager = RedisManager()
+            if redis_manager.available:
+                break
+        else:
             print("⚠️ Redis 연결 실패 - fallback 모드로 실행")
         
         websocket_manager = WebSocketManager()
         esp32_handler = ESP32Handler(redis_manager, websocket_manager)
         image_handler = ImageHandler()
         realtime_handler = RealTimeHandler(redis_manager, websocket_manager)
-        redis_manager = RedisManager()
-        
-        # 🔥 MJPEG 매니저 초기화
-        mjpeg_manager = MJPEGStreamManager()
-        
-        print("🍼 Baby Monitor Server 시작")
-        print("🎥 MJPEG 스트리밍 준비 완료")
         
         print("🍼 Baby Monitor Server 시작")
         print(f"📊 Redis: {'연결됨' if redis_manager.available else '연결 안됨'}")
@@ -89,19 +240,6 @@ if not MODULES_AVAILABLE:
             self.esp32_status = "disconnected"
             self.esp32_ip = None
     
-    class DummyMJPEGManager:
-        def __init__(self):
-            self.stream_stats = {"viewers": 0, "frame_count": 0, "esp_eye_connected": False}
-        def get_stats(self):
-            return self.stream_stats
-        def broadcast_frame(self, data):
-            pass
-        def add_viewer(self):
-            return None
-        def remove_viewer(self, q):
-            pass
-    
-    mjpeg_manager = DummyMJPEGManager()
     redis_manager = DummyManager()
     websocket_manager = DummyManager()
     esp32_handler = DummyManager()
@@ -111,96 +249,215 @@ if not MODULES_AVAILABLE:
     print("🍼 Baby Monitor Server 시작 (기본 모드)")
 
 # 🔥 MJPEG 스트리밍 매니저 클래스 추가
+# MJPEG 파트 헤더 템플릿 (프레임마다 bytes % 포맷 한 번으로 생성)
+MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+MJPEG_PART_END = b"\r\n"
+
+@lru_cache(maxsize=256)
+def mjpeg_part_header(length: int) -> bytes:
+    """Content-Length별 MJPEG 파트 헤더 (같은 카메라 프레임은 크기가 비슷해 재사용률 높음)"""
+    return MJPEG_PART_HEADER % length
+
+def _mjpeg_text_part(text: bytes) -> bytes:
+    """텍스트 MJPEG 파트 생성 (Content-Length를 본문에서 계산)"""
+    return b"--frame\r\nContent-Type: text/plain\r\nContent-Length: %d\r\n\r\n%b\r\n" % (len(text), text)
+
+# 저대역 시청자용 JPEG 재압축 (Pillow 사용 가능 시에만 - 없으면 원본 프레임 전송)
+try:
+    from PIL import Image
+    
+    def transcode_mjpeg_part(jpg: bytes, quality: int) -> Optional[bytes]:
+        """JPEG을 지정 품질로 다시 압축한 MJPEG 파트 (이미지 스레드 풀에서 실행, 원본보다 작지 않으면 None)"""
+        try:
+            buffer = io.BytesIO()
+            with Image.open(io.BytesIO(jpg)) as image:
+                image.save(buffer, "JPEG", quality=quality)
+            data = buffer.getvalue()
+        except Exception as e:
+            logger.warning("⚠️ JPEG 재압축 실패: %s", e)
+            return None
+        if len(data) >= len(jpg):
+            return None
+        return b"".join((mjpeg_part_header(len(data)), data, MJPEG_PART_END))
+except ImportError:
+    transcode_mjpeg_part = None
+
+# 스트림 제어용 텍스트 파트 (고정값이므로 모듈 로드 시 한 번만 생성)
+MJPEG_UNAVAILABLE_PART = _mjpeg_text_part(b"MJPEG service unavailable")
+MJPEG_KEEPALIVE_PART = _mjpeg_text_part(b"keepalive")
+
+# 새 프레임이 이 시간(초) 동안 없으면 발행자가 하트비트를 한 번 발행 (시청자별 타이머 없음)
+MJPEG_HEARTBEAT_INTERVAL = 5.0
+
+class StreamViewer:
+    """시청자 한 명의 전송 위치 (공유 최신 프레임의 버전만 기억 - 시청자별 큐/복사 없음)"""
+    
+    __slots__ = ("manager", "version", "seen_frame", "fresh")
+    
+    def __init__(self, manager: "MJPEGStreamManager"):
+        self.manager = manager
+        self.version = manager.frame_version  # 현재 최신 프레임은 스트림 생성기가 직접 먼저 전송
+        self.seen_frame = manager.latest_frame_version  # 마지막으로 받은 실제 프레임 (하트비트 재발행 제외)
+        self.fresh = False  # 마지막 get()이 새 프레임이었는지 (False면 하트비트 재발행/keep-alive)
+    
+    async def get(self) -> bytes:
+        """아직 전송하지 않은 새 프레임이 나올 때까지 대기 후 MJPEG 파트 반환 (그 사이 여러 프레임이 오면 최신 것만)"""
+        manager = self.manager
+        while self.version == manager.frame_version:
+            await manager.new_frame.wait()
+        
+        self.version = manager.frame_version
+        
+        # 실제 프레임 기준으로만 집계 - 못 받은 하트비트 재발행은 놓친 프레임이 아님
+        # (느린 시청자는 건너뛴 프레임 수만 집계 - 메모리는 최신 프레임 하나로 고정)
+        frame = manager.latest_frame_version
+        self.fresh = frame != self.seen_frame
+        if self.fresh:
+            skipped = frame - self.seen_frame - 1
+            if skipped > 0:
+                manager.stream_stats["dropped_frames"] += skipped
+            self.seen_frame = frame
+        return manager.published_part
+
 class MJPEGStreamManager:
+    """MJPEG 스트림 시청자 관리 (이벤트 루프 스레드에서만 사용 - 잠금 없음)"""
+    
     def __init__(self):
-        self.active_streams: List[queue.Queue] = []
+        self.active_streams: Dict[int, StreamViewer] = {}  # {id(시청자): 시청자} - O(1) 추가/제거
+        # 모든 시청자가 공유하는 최신 프레임 버전과 알림 이벤트 (발행 비용이 시청자 수와 무관)
+        self.frame_version = 0
+        self.new_frame = asyncio.Event()
+        # /ws/meta 구독자 알림 (시청자 수/프레임 수/ESP Eye 상태가 바뀔 때 - 폴링 없음)
+        self.meta_version = 0
+        self.meta_changed = asyncio.Event()
+        # 이미지 디코딩/검증 등 CPU 작업 전용 스레드 풀 (이벤트 루프를 막지 않도록)
+        self.img_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image")
         self.latest_frame: bytes = None
+        self.latest_frame_version = 0  # 새 프레임에서만 증가 (하트비트 재발행은 frame_version만 증가)
+        self.latest_part: bytes = None  # 최신 프레임의 완성된 MJPEG 파트 (모든 시청자 공유, 초기 전송/하트비트 재사용)
+        self.published_part: bytes = None  # 마지막으로 발행한 파트 (새 프레임 또는 하트비트)
+        self._last_publish = time.monotonic()
+        self.heartbeat_task: asyncio.Task = None
+        # 품질별 재압축 결과 {품질: Future[파트]} - 현재 프레임(latest_frame_version)에 대해서만 보관
+        self._quality_version = -1
+        self._quality_parts: Dict[int, asyncio.Future] = {}
         self.stream_stats = {
             "viewers": 0,
             "frame_count": 0,
+            "dropped_frames": 0,  # 느린 시청자에게 보내지 않고 건너뛴 프레임 (누적)
+            "frames_sent": 0,  # 모든 /stream 시청자에게 전송한 프레임 합계 (누적)
             "last_frame_time": None,
             "esp_eye_connected": False
         }
-        self.lock = threading.Lock()
         print("🎥 MJPEG 스트리밍 매니저 초기화")
     
-    def add_viewer(self) -> queue.Queue:
-        """새로운 시청자 추가"""
-        with self.lock:
-            frame_queue = queue.Queue(maxsize=10)
-            self.active_streams.append(frame_queue)
-            self.stream_stats["viewers"] = len(self.active_streams)
-            print(f"🔗 새 시청자 연결됨 (총 {self.stream_stats['viewers']}명)")
-            
-            # 최신 프레임이 있으면 즉시 전송
-            if self.latest_frame:
-                try:
-                    mjpeg_frame = self._create_mjpeg_frame(self.latest_frame)
-                    frame_queue.put_nowait(mjpeg_frame)
-                except queue.Full:
-                    pass
-                    
-            return frame_queue
+    def add_viewer(self) -> StreamViewer:
+        """새로운 시청자 추가 (최신 프레임은 스트림 생성기가 직접 먼저 전송)"""
+        frame_queue = StreamViewer(self)
+        self.active_streams[id(frame_queue)] = frame_queue
+        self.stream_stats["viewers"] = len(self.active_streams)
+        self._notify_meta()
+        logger.info("🔗 새 시청자 연결됨 (총 %s명)", self.stream_stats['viewers'])
+        
+        # 첫 시청자가 생기면 하트비트 시작 (시청자가 모두 나가면 루프가 스스로 종료)
+        if self.heartbeat_task is None or self.heartbeat_task.done():
+            self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        return frame_queue
     
-    def remove_viewer(self, frame_queue: queue.Queue):
+    def remove_viewer(self, frame_queue: StreamViewer):
         """시청자 제거"""
-        with self.lock:
-            if frame_queue in self.active_streams:
-                self.active_streams.remove(frame_queue)
-                self.stream_stats["viewers"] = len(self.active_streams)
-                print(f"❌ 시청자 연결 해제됨 (총 {self.stream_stats['viewers']}명)")
+        if self.active_streams.pop(id(frame_queue), None) is not None:
+            self.stream_stats["viewers"] = len(self.active_streams)
+            self._notify_meta()
+            logger.info("❌ 시청자 연결 해제됨 (총 %s명)", self.stream_stats['viewers'])
+    
+    def _notify_meta(self):
+        """스트림 메타 정보 변경을 /ws/meta 구독자에게 한 번에 알림"""
+        self.meta_version += 1
+        self.meta_changed.set()
+        self.meta_changed.clear()
+    
+    def get_meta(self) -> Dict[str, Any]:
+        """/ws/meta로 보내는 스트림 메타 정보"""
+        stats = self.stream_stats
+        return {
+            "viewers": stats["viewers"],
+            "frames": stats["frame_count"],
+            "status": "online" if stats["esp_eye_connected"] else "offline",
+        }
     
     def _create_mjpeg_frame(self, frame_data: bytes) -> bytes:
-        """🔥 올바른 MJPEG 프레임 형식 생성 (Bytes 오류 수정)"""
-        # 🔥 수정: 모든 부분을 bytes로 처리
-        boundary = b"--frame\r\n"
-        content_type = b"Content-Type: image/jpeg\r\n"
-        content_length = f"Content-Length: {len(frame_data)}\r\n\r\n".encode('utf-8')
-        frame_end = b"\r\n"
-        
-        # bytes 객체들만 연결
-        mjpeg_frame = boundary + content_type + content_length + frame_data + frame_end
-        return mjpeg_frame
+        """MJPEG 파트를 하나의 bytes로 생성
+
+        프레임당 한 번만 합치고 모든 시청자가 같은 객체를 공유 - 시청자별로는 복사 없이
+        파트 하나를 한 번의 전송(write)으로 보냄 (조각 3개를 따로 보내면 전송 3번)
+        """
+        return b"".join((mjpeg_part_header(len(frame_data)), frame_data, MJPEG_PART_END))
+    
+    def _publish(self, part: bytes):
+        """파트를 발행하고 대기 중인 시청자를 한 번에 깨움 (시청자별 작업 없음)"""
+        self.published_part = part
+        self._last_publish = time.monotonic()
+        # 느린 시청자는 다음 get()에서 그 시점의 최신 파트만 받음
+        self.frame_version += 1
+        self.new_frame.set()
+        self.new_frame.clear()
+    
+    async def _heartbeat_loop(self):
+        """새 프레임이 끊기면 최신 프레임(없으면 keep-alive 파트)을 모든 시청자에게 한 번에 재발행"""
+        try:
+            while self.active_streams:
+                await asyncio.sleep(MJPEG_HEARTBEAT_INTERVAL)
+                if time.monotonic() - self._last_publish >= MJPEG_HEARTBEAT_INTERVAL:
+                    self._publish(self.latest_part or MJPEG_KEEPALIVE_PART)
+                    logger.debug("💓 MJPEG 하트비트 발행 (시청자: %d)", len(self.active_streams))
+        except asyncio.CancelledError:
+            pass
     
     def broadcast_frame(self, frame_data: bytes):
-        """모든 시청자에게 프레임 브로드캐스트"""
+        """모든 시청자에게 프레임 브로드캐스트 (이벤트 루프에서 호출, 대기 없음)"""
         if not frame_data or len(frame_data) < 100:
             return
-            
-        with self.lock:
-            # 최신 프레임 저장
-            self.latest_frame = frame_data
-            self.stream_stats["frame_count"] += 1
-            self.stream_stats["last_frame_time"] = time.time()
-            self.stream_stats["esp_eye_connected"] = True
-            
-            # MJPEG 프레임 생성
-            mjpeg_frame = self._create_mjpeg_frame(frame_data)
-            
-            # 모든 활성 스트림에 전송
-            dead_queues = []
-            for frame_queue in self.active_streams[:]:
-                try:
-                    # 큐가 가득 찬 경우 오래된 프레임 제거
-                    while frame_queue.qsize() >= frame_queue.maxsize - 1:
-                        try:
-                            frame_queue.get_nowait()
-                        except queue.Empty:
-                            break
-                    
-                    frame_queue.put_nowait(mjpeg_frame)
-                except Exception as e:
-                    print(f"⚠️ 큐 오류: {e}")
-                    dead_queues.append(frame_queue)
-            
-            # 죽은 큐 정리
-            for dead_queue in dead_queues:
-                self.remove_viewer(dead_queue)
-            
-            # 로깅 (30프레임마다)
-            if self.stream_stats["frame_count"] % 30 == 0:
-                print(f"📺 프레임 {self.stream_stats['frame_count']} 브로드캐스트 "
-                      f"(시청자: {len(self.active_streams)}, 크기: {len(frame_data)} bytes)")
+        
+        # 최신 프레임 저장
+        self.latest_frame = frame_data
+        self.latest_frame_version += 1
+        self.stream_stats["frame_count"] += 1
+        self.stream_stats["last_frame_time"] = time.time()
+        self.stream_stats["esp_eye_connected"] = True
+        
+        # MJPEG 프레임 생성 (시청자 수와 관계없이 프레임당 한 번, 이후 재전송 시 재사용)
+        self.latest_part = self._create_mjpeg_frame(frame_data)
+        
+        self._publish(self.latest_part)
+        self._notify_meta()
+        
+        logger.debug("📺 프레임 %d 브로드캐스트 (시청자: %d, 크기: %d bytes)",
+                     self.stream_stats["frame_count"], len(self.active_streams), len(frame_data))
+    
+    async def get_quality_part(self, quality: int) -> bytes:
+        """최신 프레임을 지정 품질로 재압축한 MJPEG 파트
+
+        프레임·품질마다 한 번만 재압축하고 같은 품질의 시청자들이 결과를 공유
+        (재압축할 수 없거나 원본이 더 작으면 원본 파트)
+        """
+        if transcode_mjpeg_part is None:
+            return self.latest_part
+        
+        # 하트비트 재발행은 같은 프레임이므로 재압축 결과를 그대로 사용
+        if self._quality_version != self.latest_frame_version:
+            self._quality_version = self.latest_frame_version
+            self._quality_parts = {}
+        
+        future = self._quality_parts.get(quality)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.img_executor, transcode_mjpeg_part, self.latest_frame, quality
+            )
+            self._quality_parts[quality] = future
+        
+        # 한 시청자의 연결이 끊겨도 다른 시청자가 기다리는 작업은 취소되지 않도록 shield
+        return await asyncio.shield(future) or self.latest_part
     
     def get_stats(self) -> Dict[str, Any]:
         """스트리밍 통계 반환"""
@@ -211,78 +468,120 @@ class MJPEGStreamManager:
             "has_latest_frame": self.latest_frame is not None
         }
 
-# 🔥 전역 MJPEG 매니저 인스턴스
+# 🔥 전역 MJPEG 매니저 인스턴스 (모듈 사용 여부와 관계없이 클래스 정의 후 생성)
 mjpeg_manager = MJPEGStreamManager()
+MJPEG_MANAGER_TYPE = str(type(mjpeg_manager))
+print("🎥 MJPEG 스트리밍 준비 완료")
+
+# /esp32/image/raw 최대 본문 크기 (ESP32-CAM JPEG은 보통 50~200KB)
+MAX_RAW_IMAGE_BYTES = 1024 * 1024
+
+# 센서 데이터 판별용 키 (하나라도 있으면 센서 데이터)
+SENSOR_KEYS = frozenset(("temperature", "humidity", "movement", "sound"))
+
+# /esp32/data 처리 작업 종류별 로그 라벨
+JOB_LABELS = {"image": "이미지", "sensor": "센서", "default": "기본"}
 
 # 🔥 수정: 통합된 ESP32 데이터 엔드포인트 (중복 제거)
+async def read_json_body(request: Request) -> Dict[str, Any]:
+    """요청 본문을 Pydantic 검증 없이 바로 JSON 객체로 파싱"""
+    try:
+        data = json_loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="JSON object expected")
+    return data
+
 @app.post("/esp32/data")
-async def receive_esp32_data(request: Request, data: Dict[str, Any]):
+async def receive_esp32_data(request: Request):
     """ESP32에서 통합 데이터 수신 (센서 + 이미지 혼합 가능)"""
+    data = await read_json_body(request)
+    return await process_esp32_payload(data, request.client.host, len(await request.body()))
+
+async def process_esp32_payload(data: Dict[str, Any], client_ip: str, body_size: int = 0,
+                                decoded: Optional[tuple] = None):
+    """ESP32 데이터 처리 (센서/이미지 판별 후 핸들러 실행 및 브로드캐스트)
+
+    decoded: 이미 (base64, JPEG 바이트)를 가지고 있으면 전달 (/esp32/image/raw - 디코딩 생략)
+    """
     if not MODULES_AVAILABLE:
         return {
             "status": "fallback_mode",
             "message": "Modules not available - running in basic mode",
             "data_received": {
-                "size": len(str(data)),
+                "size": body_size,
                 "has_image": "image" in data,
-                "has_sensor": any(key in data for key in ["temperature", "humidity", "movement", "sound"])
+                "has_sensor": not SENSOR_KEYS.isdisjoint(data)
             }
         }
     
     try:
-        client_ip = request.client.host
-        
         # 데이터 타입 판별
         has_image = "image" in data and data["image"]
-        has_sensor = any(key in data for key in ["temperature", "humidity", "movement", "sound"])
-        
-        print(f"📡 ESP32 데이터 수신 from {client_ip}: 이미지={has_image}, 센서={has_sensor}")
+        has_sensor = not SENSOR_KEYS.isdisjoint(data)
         
-        results = []
+        logger.debug("📡 ESP32 데이터 수신 from %s: 이미지=%s, 센서=%s", client_ip, bool(has_image), has_sensor)
         
-        # 이미지 데이터 처리
-        if has_image:
-            print(f"👁️ 이미지 데이터 처리 중... ({len(data.get('image', ''))} bytes)")
-            try:
-                image_result = await esp32_handler.handle_esp_eye_data(data, client_ip)
-                results.append({"type": "image", "result": image_result})
-            except Exception as img_error:
-                print(f"❌ 이미지 처리 오류: {img_error}")
-                results.append({"type": "image", "result": {"error": str(img_error)}})
+        timestamp = current_timestamp()
+        connection_count = len(websocket_manager.active_connections)
         
-        # 센서 데이터 처리
-        if has_sensor:
-            print(f"📊 센서 데이터 처리 중...")
-            try:
-                sensor_result = await esp32_handler.handle_esp32_data(data, client_ip)
-                results.append({"type": "sensor", "result": sensor_result})
-            except Exception as sensor_error:
-                print(f"❌ 센서 처리 오류: {sensor_error}")
-                results.append({"type": "sensor", "result": {"error": str(sensor_error)}})
-        
-        # 둘 다 없으면 기본 처리
-        if not has_image and not has_sensor:
-            try:
-                default_result = await esp32_handler.handle_esp32_data(data, client_ip)
-                results.append({"type": "default", "result": default_result})
-            except Exception as default_error:
-                print(f"❌ 기본 처리 오류: {default_error}")
-                results.append({"type": "default", "result": {"error": str(default_error)}})
-        
-        # 🔥 실시간 브로드캐스트 (WebSocket)
-        if websocket_manager.active_connections:
+        # 🔥 실시간 브로드캐스트 (WebSocket) - 원본 data만 보내므로 처리 결과를 기다릴 필요 없음.
+        # 먼저 큐에 넣어 두면 배치 작업이 아래 처리와 동시에 전송
+        if connection_count:
             try:
                 broadcast_data = {
                     "type": "new_data",
                     "source": "esp32",
                     "data": data,
                     "client_ip": client_ip,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                    "timestamp": timestamp
                 }
-                await websocket_manager.broadcast_to_apps(broadcast_data)
-                print(f"📡 {len(websocket_manager.active_connections)}개 앱에 브로드캐스트 완료")
-            except Exception as broadcast_error:
-                print(f"⚠️ 브로드캐스트 오류: {broadcast_error}")
+                websocket_manager.queue_app_broadcast(broadcast_data)
+            except Exception:
+                logger.exception("⚠️ 브로드캐스트 오류")
+        
+        # 이미지/센서 처리는 서로 독립적이므로 동시에 실행
+        jobs = []
+        results = []
+        if has_image:
+            logger.debug("👁️ 이미지 데이터 처리 중... (%d bytes)", len(data["image"]))
+            # 직전과 같은 이미지면 디코딩/시청자 재전송 모두 생략 (핸들러가 "변경 없음" 결과 반환)
+            digest = image_digest(data["image"])
+            if esp32_handler.is_unchanged_image(digest):
+                logger.debug("👁️ 이전과 동일한 이미지 - 디코딩/스트림 전송 생략")
+            else:
+                # base64는 여기서 한 번만 디코딩하고, MJPEG 시청자와 핸들러 모두 같은 바이트를 사용
+                try:
+                    if decoded is None:
+                        decoded = await asyncio.get_running_loop().run_in_executor(
+                            mjpeg_manager.img_executor, decode_image, data["image"]
+                        )
+                    mjpeg_manager.broadcast_frame(decoded[1])
+                except (binascii.Error, ValueError) as e:
+                    logger.warning("⚠️ 이미지 base64 디코딩 실패: %s", e)
+                    # 이전 이미지를 유지 (핸들러에서 이벤트 루프 위 재디코딩/저장 없음)
+                    results.append({"type": "image", "result": esp32_handler.image_decode_error(e)})
+            if not results:
+                jobs.append(("image", esp32_handler.handle_esp_eye_data(data, client_ip, decoded, digest)))
+        
+        # 대시보드 최근 활동 기록 (감지 상태/환경 값이 바뀐 경우만)
+        dashboard_events.record_sensor_activity(data)
+        
+        if has_sensor:
+            logger.debug("📊 센서 데이터 처리 중...")
+            jobs.append(("sensor", esp32_handler.handle_esp32_data(data, client_ip)))
+        elif not has_image:
+            # 둘 다 없으면 기본 처리
+            jobs.append(("default", esp32_handler.handle_esp32_data(data, client_ip)))
+        
+        outcomes = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+        
+        for (job_type, _), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("❌ %s 처리 오류", JOB_LABELS[job_type], exc_info=outcome)
+                outcome = {"error": str(outcome)}
+            results.append({"type": job_type, "result": outcome})
         
         return {
             "status": "success",
@@ -290,12 +589,12 @@ async def receive_esp32_data(request: Request, data: Dict[str, Any]):
             "received_from": client_ip,
             "processed_types": [r["type"] for r in results],
             "results": results,
-            "broadcast_sent": len(websocket_manager.active_connections) if hasattr(websocket_manager, 'active_connections') else 0,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "broadcast_sent": connection_count,
+            "timestamp": timestamp
         }
         
     except Exception as e:
-        print(f"❌ ESP32 데이터 수신 총 오류: {e}")
+        logger.exception("❌ ESP32 데이터 수신 총 오류")
         raise HTTPException(status_code=500, detail=f"ESP32 data processing failed: {str(e)}")
 
 # 🔥 수정: 개별 엔드포인트들 (호환성 유지)
@@ -310,7 +609,7 @@ async def receive_esp32_sensor_data(request: Request, data: Dict[str, Any]):
     
     try:
         client_ip = request.client.host
-        print(f"📡 ESP32 센서 데이터 수신 from {client_ip}: {data}")
+        logger.debug("📡 ESP32 센서 데이터 수신 from %s: %s", client_ip, data)
         
         result = await esp32_handler.handle_esp32_data(data, client_ip)
         
@@ -320,15 +619,40 @@ async def receive_esp32_sensor_data(request: Request, data: Dict[str, Any]):
             "endpoint": "esp32_sensor"
         }
     except Exception as e:
-        print(f"❌ ESP32 센서 데이터 수신 오류: {e}")
+        logger.error("❌ ESP32 센서 데이터 수신 오류: %s", e)
         raise HTTPException(status_code=500, detail=f"ESP32 sensor data processing failed: {str(e)}")
 
 
 @app.post("/esp32/image")
-async def receive_esp_eye_image_data(request: Request, data: Dict[str, Any]):
+async def receive_esp_eye_image_data(request: Request):
     """ESP Eye에서 이미지 데이터만 수신 (호환성 유지)"""
-    print(f"👁️ 이미지 전용 엔드포인트 호출 - /esp32/data로 리다이렉트")
-    return await receive_esp32_data(request, data)
+    logger.debug("👁️ 이미지 전용 엔드포인트 호출 - /esp32/data 처리로 전달")
+    data = await read_json_body(request)
+    return await process_esp32_payload(data, request.client.host, len(await request.body()))
+
+@app.post("/esp32/image/raw")
+async def receive_esp_eye_raw_image(request: Request):
+    """ESP Eye에서 JPEG 원본을 그대로 수신 (Content-Type: image/jpeg, base64/JSON 없음)
+
+    width/height/quality 등 메타데이터는 쿼리 파라미터로 전달
+    """
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+        if len(buf) > MAX_RAW_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+    if not buf:
+        raise HTTPException(status_code=400, detail="Empty image body")
+    
+    jpg = bytes(buf)
+    data: Dict[str, Any] = dict(request.query_params)
+    
+    # /images/latest 등 base64를 쓰는 곳을 위해 인코딩만 한 번 (스레드 풀에서)
+    decoded = await asyncio.get_running_loop().run_in_executor(
+        mjpeg_manager.img_executor, encode_image, jpg
+    )
+    data["image"] = decoded[0]
+    return await process_esp32_payload(data, request.client.host, len(jpg), decoded)
 
 @app.post("/esp32/command")
 async def send_command_to_esp32(command_data: Dict[str, Any]):
@@ -362,8 +686,8 @@ def get_time_info():
     if realtime_handler:
         return realtime_handler.get_time_info()
     else:
-        current_kst = datetime.now(KST)
         current_utc = datetime.now(timezone.utc)
+        current_kst = current_utc.astimezone(KST)
         
         return {
             "utc_time": current_utc.isoformat(),
@@ -374,45 +698,67 @@ def get_time_info():
             "message": "실시간 핸들러 비활성화" if not realtime_handler else "정상"
         }
 
-@app.get("/")
-def read_root():
-    """서버 상태 및 정보"""
-    return {
-        "message": "Baby Monitor Server is running!",
-        "role": "ESP32-CAM ↔ Mobile App Bridge",
+# 루트/헬스/상태 응답의 고정 부분 (시작 시 한 번만 직렬화)
+ROOT_STATIC = static_json_prefix({
+    "message": "Baby Monitor Server is running!",
+    "role": "ESP32-CAM ↔ Mobile App Bridge",
+    "version": "2.0.0",
+    "modules_available": MODULES_AVAILABLE,
+    "endpoints": {
+        "esp32_data": "/esp32/data (POST) - 통합 데이터 수신",
+        "esp32_sensor": "/esp32/sensor (POST) - 센서 데이터",
+        "esp32_image": "/esp32/image (POST) - 이미지 데이터",
+        "esp32_image_raw": "/esp32/image/raw (POST, image/jpeg) - JPEG 원본 수신",
+        "esp32_command": "/esp32/command (POST) - ESP32 명령", 
+        "app_websocket": "/app/stream (WebSocket)",
+        "video_websocket": "/stream/ws (WebSocket, JPEG 바이너리) - 앱 권장",
+        "video_mjpeg": "/stream (MJPEG) - 브라우저 호환",
+        "current_status": "/status",
+        "time_info": "/app/time",
+        "health_check": "/health",
+        "test_page": "/test",
+        "dashboard": "/dashboard"
+    }
+})
+HEALTH_STATIC = static_json_prefix({"status": "healthy", "modules_available": MODULES_AVAILABLE})
+STATUS_STATIC = static_json_prefix({
+    "server": {
+        "status": "running",
         "version": "2.0.0",
         "modules_available": MODULES_AVAILABLE,
+        "startup_time": SERVER_STARTED_AT
+    }
+})
+
+def root_body() -> bytes:
+    """/ 응답 본문 (/bootstrap과 공유)"""
+    return static_json_body(ROOT_STATIC, {
         "status": {
             "redis": "connected" if (MODULES_AVAILABLE and redis_manager.available) else "disconnected", 
-            "active_app_connections": len(websocket_manager.active_connections) if (MODULES_AVAILABLE and hasattr(websocket_manager, 'active_connections')) else 0,
-            "esp32": esp32_handler.esp32_status if (MODULES_AVAILABLE and hasattr(esp32_handler, 'esp32_status')) else "unknown"
-        },
-        "endpoints": {
-            "esp32_data": "/esp32/data (POST) - 통합 데이터 수신",
-            "esp32_sensor": "/esp32/sensor (POST) - 센서 데이터",
-            "esp32_image": "/esp32/image (POST) - 이미지 데이터",
-            "esp32_command": "/esp32/command (POST) - ESP32 명령", 
-            "app_websocket": "/app/stream (WebSocket)",
-            "current_status": "/status",
-            "time_info": "/app/time",
-            "health_check": "/health",
-            "test_page": "/test",
-            "dashboard": "/dashboard"
+            "active_app_connections": len(websocket_manager.active_connections) if MODULES_AVAILABLE else 0,
+            "esp32": esp32_handler.esp32_status if MODULES_AVAILABLE else "unknown"
         },
         "timestamp": datetime.now().isoformat()
-    }
+    })
+
+def health_body() -> bytes:
+    """/health 응답 본문 (/bootstrap과 공유)"""
+    return static_json_body(HEALTH_STATIC, {
+        "redis": MODULES_AVAILABLE and redis_manager.available,
+        "esp32_connected": (esp32_handler.esp32_status == "connected") if MODULES_AVAILABLE else False,
+        "active_connections": len(websocket_manager.active_connections) if MODULES_AVAILABLE else 0,
+        "timestamp": datetime.now().isoformat()
+    })
+
+@app.get("/")
+def read_root():
+    """서버 상태 및 정보"""
+    return Response(content=root_body(), media_type="application/json")
 
 @app.get("/health")
 def health_check():
     """기본 헬스 체크 (JSON)"""
-    return {
-        "status": "healthy",
-        "modules_available": MODULES_AVAILABLE,
-        "redis": (MODULES_AVAILABLE and redis_manager.available) if MODULES_AVAILABLE else False,
-        "esp32_connected": (esp32_handler.esp32_status == "connected") if (MODULES_AVAILABLE and hasattr(esp32_handler, 'esp32_status')) else False,
-        "active_connections": len(websocket_manager.active_connections) if (MODULES_AVAILABLE and hasattr(websocket_manager, 'active_connections')) else 0,
-        "timestamp": datetime.now().isoformat()
-    }
+    return Response(content=health_body(), media_type="application/json")
 
 # 🔥 수정: 앱 종료 시 정리
 @app.on_event("shutdown")
@@ -424,6 +770,14 @@ async def shutdown_event():
             print("💓 실시간 하트비트 중지됨")
         except Exception as e:
             print(f"⚠️ 하트비트 중지 오류: {e}")
+    
+    if MODULES_AVAILABLE:
+        websocket_manager.stop_broadcast_worker()
+    
+    if mjpeg_manager.heartbeat_task and not mjpeg_manager.heartbeat_task.done():
+        mjpeg_manager.heartbeat_task.cancel()
+    mjpeg_manager.img_executor.shutdown(wait=False, cancel_futures=True)
+    stop_logging()
 
 # 🔥 수정: 앱 API 핸들러 초기화
 if MODULES_AVAILABLE:
@@ -472,25 +826,47 @@ async def debug_image_data():
         return {"error": str(e)}
 
 # 🔥 새로 추가: 이미지 관련 API 엔드포인트
+# /images/latest 응답 본문 캐시: (이미지 timestamp, JSON bytes) - 튜플 통째로 교체하므로 스레드 간 읽기 안전
+_latest_image_body = (None, None)
+
+def latest_image_body() -> Optional[bytes]:
+    """최신 이미지 응답 본문 (이미지가 바뀐 경우에만 큰 본문을 조회/직렬화 - 워커 스레드에서 실행)"""
+    global _latest_image_body
+    
+    # 작은 메타데이터로 먼저 변경 여부 확인
+    meta = redis_manager.get_latest_image_meta()
+    if not meta:
+        return None
+    cached_timestamp, body = _latest_image_body
+    if body is not None and meta.get("timestamp") and meta["timestamp"] == cached_timestamp:
+        return body
+    
+    image_data = redis_manager.get_latest_image()
+    if not image_data:
+        return None
+    image_base64 = image_data.get("image_base64", "")
+    body = json_dumps({
+        "status": "success",
+        "has_image": True,
+        "image_base64": image_base64,
+        "timestamp": image_data.get("timestamp"),
+        "metadata": image_data.get("metadata", {}),
+        "size": len(image_base64)
+    })
+    # image:latest_meta 해시는 문자열로 저장되므로 같은 형태로 비교
+    _latest_image_body = (str(image_data.get("timestamp", "")), body)
+    return body
+
 @app.get("/images/latest")
-async def get_latest_image():
-    """최신 이미지 조회"""
+def get_latest_image():
+    """최신 이미지 조회 (같은 이미지면 직렬화해 둔 응답 재사용)"""
     if not MODULES_AVAILABLE:
         return {"error": "Modules not available"}
     
     try:
-        # Redis에서 최신 이미지 데이터 가져오기
-        if redis_manager and hasattr(redis_manager, 'get_latest_image'):
-            image_data = redis_manager.get_latest_image()
-            if image_data:
-                return {
-                    "status": "success",
-                    "has_image": True,
-                    "image_base64": image_data.get("image_base64", ""),
-                    "timestamp": image_data.get("timestamp"),
-                    "metadata": image_data.get("metadata", {}),
-                    "size": len(image_data.get("image_base64", ""))
-                }
+        body = latest_image_body()
+        if body is not None:
+            return Response(content=body, media_type="application/json")
         
         return {
             "status": "no_image",
@@ -499,13 +875,35 @@ async def get_latest_image():
         }
         
     except Exception as e:
-        print(f"❌ 최신 이미지 조회 오류: {e}")
+        logger.error("❌ 최신 이미지 조회 오류: %s", e)
         return {
             "status": "error",
             "has_image": False,
             "message": f"이미지 조회 실패: {str(e)}"
         }
 
+@app.get("/images/latest.jpg")
+def get_latest_image_jpg():
+    """최신 이미지 JPEG 원본 (base64 JSON 없이 - 대시보드 이미지 모드용)"""
+    if not MODULES_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Modules not available")
+    
+    # 이 워커가 받은 최신 프레임이 있으면 Redis 조회 없이 그대로 전송
+    jpg_bytes = mjpeg_manager.latest_frame
+    if jpg_bytes:
+        timestamp = datetime.fromtimestamp(mjpeg_manager.stream_stats["last_frame_time"], timezone.utc).isoformat()
+    else:
+        jpg_bytes, metadata = redis_manager.get_latest_image_binary()
+        timestamp = (metadata or {}).get("timestamp", "")
+    
+    if not jpg_bytes:
+        raise HTTPException(status_code=404, detail="이미지가 없습니다")
+    return Response(
+        content=jpg_bytes,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "no-store", "X-Timestamp": timestamp}
+    )
+
 @app.get("/images/latest/data")
 async def get_latest_image_data():
     """최신 이미지 데이터만 (base64)"""
@@ -525,33 +923,46 @@ async def get_latest_image_data():
         return {"image": None, "timestamp": None}
         
     except Exception as e:
-        print(f"❌ 이미지 데이터 조회 오류: {e}")
+        logger.error("❌ 이미지 데이터 조회 오류: %s", e)
         return {"image": None, "error": str(e)}
 
 # 🔥 새로 추가: 상태 엔드포인트
-@app.get("/status")
-def get_detailed_status():
-    """상세 서버 상태 정보"""
-    return {
-        "server": {
-            "status": "running",
-            "version": "2.0.0",
-            "modules_available": MODULES_AVAILABLE,
-            "startup_time": datetime.now().isoformat()
-        },
+def status_body() -> bytes:
+    """/status 응답 본문 (/bootstrap과 공유)"""
+    return static_json_body(STATUS_STATIC, {
         "redis": {
-            "available": (MODULES_AVAILABLE and redis_manager.available) if MODULES_AVAILABLE else False,
+            "available": MODULES_AVAILABLE and redis_manager.available,
             "status": "connected" if (MODULES_AVAILABLE and redis_manager.available) else "disconnected"
         },
         "esp32": {
-            "status": esp32_handler.esp32_status if (MODULES_AVAILABLE and hasattr(esp32_handler, 'esp32_status')) else "unknown",
-            "ip": esp32_handler.esp32_ip if (MODULES_AVAILABLE and hasattr(esp32_handler, 'esp32_ip')) else None
+            "status": esp32_handler.esp32_status if MODULES_AVAILABLE else "unknown",
+            "ip": esp32_handler.esp32_ip if MODULES_AVAILABLE else None
         },
         "websocket": {
-            "active_connections": len(websocket_manager.active_connections) if (MODULES_AVAILABLE and hasattr(websocket_manager, 'active_connections')) else 0
+            "active_connections": len(websocket_manager.active_connections) if MODULES_AVAILABLE else 0
         },
         "timestamp": datetime.now().isoformat()
-    }
+    })
+
+@app.get("/status")
+def get_detailed_status():
+    """상세 서버 상태 정보"""
+    return Response(content=status_body(), media_type="application/json")
+
+@app.get("/bootstrap")
+def get_bootstrap():
+    """페이지 초기 로드용 묶음 응답 (/health, /status, / 와 아기 상태를 요청 한 번으로)"""
+    # 각 본문은 이미 JSON bytes이므로 다시 직렬화하지 않고 그대로 이어 붙임
+    return Response(
+        content=b"".join((
+            b'{"health":', health_body(),
+            b',"status":', status_body(),
+            b',"root":', root_body(),
+            b',"baby_status":', json_dumps(collect_baby_status()),
+            b"}",
+        )),
+        media_type="application/json"
+    )
 
 # 🔥 간단한 테스트 엔드포인트
 # 🔥 Redis 수동 재연결 엔드포인트
@@ -580,183 +991,272 @@ def reconnect_redis():
 # ESP32 관련 엔드포인트
 # =========================
 
+# 한 프레임 전송이 이 시간(초) 안에 끝나지 않으면 막힌 시청자로 보고 연결 종료
+MJPEG_SEND_TIMEOUT = 2.0
+
+# /stream 응답 헤더 (ASGI 형식으로 미리 인코딩 - 요청마다 dict 생성/인코딩 없음)
+MJPEG_STREAM_HEADERS = [
+    (b"content-type", b"multipart/x-mixed-replace; boundary=frame"),
+    (b"cache-control", b"no-cache, no-store, must-revalidate"),
+    (b"pragma", b"no-cache"),
+    (b"expires", b"0"),
+    (b"connection", b"keep-alive"),
+    (b"access-control-allow-origin", b"*"),
+    (b"x-accel-buffering", b"no"),
+]
+
+class MJPEGStreamingResponse(StreamingResponse):
+    """프레임 전송마다 타임아웃을 거는 StreamingResponse (읽지 않는 클라이언트를 빠르게 정리)
+
+    연결 끊김은 StreamingResponse가 이미 감지해 생성기를 취소하지만, 연결은 살아 있으면서
+    데이터를 읽지 않는 클라이언트는 send()가 무한정 대기하므로 여기서 시간 제한
+    """
+    
+    def init_headers(self, headers=None) -> None:
+        # 미리 인코딩한 헤더 사용 (미들웨어가 목록을 수정할 수 있으므로 응답마다 얕은 복사)
+        self.raw_headers = list(MJPEG_STREAM_HEADERS)
+    
+    async def stream_response(self, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        try:
+            async for chunk in self.body_iterator:
+                await asyncio.wait_for(
+                    send({"type": "http.response.body", "body": chunk, "more_body": True}),
+                    timeout=MJPEG_SEND_TIMEOUT
+                )
+        except asyncio.TimeoutError:
+            # 응답을 끝내지 않고 반환하면 서버가 연결을 닫음
+            logger.warning("⚠️ 스트림 전송 지연 %.1f초 초과 - 시청자 연결 종료", MJPEG_SEND_TIMEOUT)
+            return
+        finally:
+            await self.body_iterator.aclose()  # 생성기 finally에서 시청자 정리
+        
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
 # main.py의 /stream 엔드포인트 디버깅 강화 버전
 
 @app.get("/stream")
-async def mjpeg_stream_viewer():
-    """클라이언트용 MJPEG 스트림 (디버깅 강화)"""
+async def mjpeg_stream_viewer(q: Optional[int] = Query(None, ge=10, le=95)):
+    """클라이언트용 MJPEG 스트림 (디버깅 강화)
+
+    q: JPEG 품질 (느린 회선용 - 지정 시 10 단위로 낮춰 재압축, 생략 시 카메라 원본)
+    """
     
-    print("🎬 /stream 엔드포인트 호출됨")
+    logger.debug("🎬 /stream 엔드포인트 호출됨")
+    # 10 단위로 묶어 같은 구간의 시청자들이 재압축 결과를 공유
+    quality = q // 10 * 10 if q else None
     
-    def generate_stream():
-        """MJPEG 스트림 생성기 (디버깅 강화)"""
-        print("📺 스트림 생성기 시작")
+    async def generate_stream():
+        """MJPEG 스트림 생성기 (이벤트 루프에서 직접 대기 - 스레드 사용 안 함)"""
+        logger.debug("📺 스트림 생성기 시작")
         
         if not MODULES_AVAILABLE:
-            print("⚠️ 모듈 사용 불가 - 더미 응답")
-            yield b"--frame\r\nContent-Type: text/plain\r\nContent-Length: 26\r\n\r\nMJPEG service unavailable\r\n"
+            logger.warning("⚠️ 모듈 사용 불가 - 더미 응답")
+            yield MJPEG_UNAVAILABLE_PART
             return
         
-        # mjpeg_manager 존재 확인
-        if not hasattr(mjpeg_manager, 'add_viewer'):
-            print("❌ mjpeg_manager에 add_viewer 메서드 없음")
-            yield b"--frame\r\nContent-Type: text/plain\r\nContent-Length: 30\r\n\r\nMJPEG manager not available\r\n"
-            return
-            
         frame_queue = mjpeg_manager.add_viewer()
-        if frame_queue is None:
-            print("❌ frame_queue가 None")
-            yield b"--frame\r\nContent-Type: text/plain\r\nContent-Length: 26\r\n\r\nMJPEG service unavailable\r\n"
-            return
-        
-        print(f"✅ 시청자 추가됨, 큐 생성: {frame_queue}")
+        logger.debug("✅ 시청자 추가됨")
         
         try:
-            consecutive_timeouts = 0
-            max_timeouts = 12  # 60초로 연장
+            idle_heartbeats = 0
+            max_idle_heartbeats = 12  # 프레임 없이 하트비트만 60초 지속되면 종료
             frame_sent = 0
             
             # 🔥 즉시 최신 프레임 전송 (있다면)
-            if mjpeg_manager.latest_frame:
-                print(f"📤 최신 프레임 즉시 전송: {len(mjpeg_manager.latest_frame)} bytes")
-                initial_frame = mjpeg_manager._create_mjpeg_frame(mjpeg_manager.latest_frame)
-                yield initial_frame
+            if mjpeg_manager.latest_part:
+                logger.debug("📤 최신 프레임 즉시 전송: %s bytes", len(mjpeg_manager.latest_frame))
+                yield await mjpeg_manager.get_quality_part(quality) if quality else mjpeg_manager.latest_part
                 frame_sent += 1
+                mjpeg_manager.stream_stats["frames_sent"] += 1
+            
+            # 프레임마다 반복되는 속성/전역 조회를 루프 밖에서 한 번만 수행
+            get_part = frame_queue.get
+            get_quality_part = mjpeg_manager.get_quality_part
+            keepalive_part = MJPEG_KEEPALIVE_PART
+            stream_stats = mjpeg_manager.stream_stats
+            debug = logger.debug
             
-            while consecutive_timeouts < max_timeouts:
+            while idle_heartbeats < max_idle_heartbeats:
                 try:
-                    # 큐에서 프레임 대기 (5초 타임아웃)
-                    frame_data = frame_queue.get(timeout=5.0)
-                    yield frame_data
-                    frame_sent += 1
-                    consecutive_timeouts = 0
-                    
-                    if frame_sent % 10 == 0:
-                        print(f"📺 스트림 전송 중: {frame_sent}프레임 전송됨")
-                    
-                except queue.Empty:
-                    consecutive_timeouts += 1
-                    print(f"⏰ 스트림 타임아웃 {consecutive_timeouts}/{max_timeouts}")
+                    # 새 프레임 또는 매니저 하트비트 대기 (keep-alive는 발행자가 모든 시청자에게 한 번에 발행)
+                    part = await get_part()
+                    if quality and part is not keepalive_part:
+                        part = await get_quality_part(quality)
+                    yield part
                     
-                    # Keep-alive: 최신 프레임 재전송
-                    if mjpeg_manager.latest_frame:
-                        print("🔄 최신 프레임 재전송")
-                        keep_alive = mjpeg_manager._create_mjpeg_frame(mjpeg_manager.latest_frame)
-                        yield keep_alive
+                    if part is keepalive_part:
+                        idle_heartbeats += 1
+                        debug("📡 Keep-alive 전송 %s/%s", idle_heartbeats, max_idle_heartbeats)
+                    elif frame_queue.fresh:
+                        # 프레임별 로그 대신 누적 카운터만 갱신 (/stream/status에서 확인)
                         frame_sent += 1
-                        consecutive_timeouts = max(0, consecutive_timeouts - 1)  # 카운터 감소
-                    else:
-                        # 더미 keep-alive
-                        print("📡 Keep-alive 전송")
-                        keep_alive = b"--frame\r\nContent-Type: text/plain\r\nContent-Length: 9\r\n\r\nkeepalive\r\n"
-                        yield keep_alive
+                        stream_stats["frames_sent"] += 1
+                        idle_heartbeats = 0
                     
                 except Exception as e:
-                    print(f"❌ 스트림 생성 중 오류: {e}")
+                    logger.error("❌ 스트림 생성 중 오류: %s", e)
                     break
             
-            print(f"🔚 스트림 종료: 총 {frame_sent}프레임 전송")
+            logger.debug("🔚 스트림 종료: 총 %s프레임 전송", frame_sent)
         
         except Exception as e:
-            print(f"❌ 스트림 생성기 전체 오류: {e}")
+            logger.error("❌ 스트림 생성기 전체 오류: %s", e)
         finally:
             # 시청자 정리
-            print("🧹 시청자 정리 중...")
-            if hasattr(mjpeg_manager, 'remove_viewer'):
-                mjpeg_manager.remove_viewer(frame_queue)
-            print("🔌 스트림 연결 완전 종료")
-    
-    print("🎥 StreamingResponse 생성 중...")
-    response = StreamingResponse(
-        generate_stream(),
-        media_type="multipart/x-mixed-replace; boundary=frame",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache", 
-            "Expires": "0",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "X-Accel-Buffering": "no",
-        }
-    )
-    print("📤 StreamingResponse 반환")
+            logger.debug("🧹 시청자 정리 중...")
+            mjpeg_manager.remove_viewer(frame_queue)
+            logger.debug("🔌 스트림 연결 완전 종료")
+    
+    logger.debug("🎥 StreamingResponse 생성 중...")
+    response = MJPEGStreamingResponse(generate_stream())
+    logger.debug("📤 StreamingResponse 반환")
     return response
 
+@app.websocket("/ws/stream")
+@app.websocket("/stream/ws")
+async def jpeg_stream_websocket(websocket: WebSocket):
+    """JPEG 바이너리 WebSocket 스트림 (모바일 앱 권장 - MJPEG 헤더/HTTP 파싱 없이 프레임마다 JPEG 그대로 전송)"""
+    await websocket.accept()
+    
+    if not MODULES_AVAILABLE:
+        await websocket.close(code=1013, reason="Stream service unavailable")
+        return
+    
+    frame_queue = mjpeg_manager.add_viewer()
+    try:
+        # 최신 프레임 즉시 전송 (있다면)
+        sent_version = mjpeg_manager.latest_frame_version
+        if mjpeg_manager.latest_frame:
+            await websocket.send_bytes(mjpeg_manager.latest_frame)
+        
+        while True:
+            part = await frame_queue.get()
+            if part is MJPEG_KEEPALIVE_PART or mjpeg_manager.latest_frame_version == sent_version:
+                # 매니저 하트비트 (프레임 없음 또는 같은 프레임 재발행) - 같은 JPEG을 다시 보내지 않고 끊긴 연결 감지용 텍스트만
+                await websocket.send_text("keepalive")
+                continue
+            sent_version = mjpeg_manager.latest_frame_version
+            # MJPEG 헤더 없이 JPEG 본문만 그대로 전송 (대기 후 곧바로 읽으므로 get()이 깨운 그 프레임)
+            # /stream과 같은 시간 제한 - 읽지 않는 클라이언트가 전송 대기에 묶여 있지 않도록
+            await asyncio.wait_for(websocket.send_bytes(mjpeg_manager.latest_frame), timeout=MJPEG_SEND_TIMEOUT)
+    
+    except asyncio.TimeoutError:
+        logger.warning("⚠️ WebSocket 스트림 전송 지연 %.1f초 초과 - 시청자 연결 종료", MJPEG_SEND_TIMEOUT)
+        try:
+            # 닫기 프레임도 보내지 못할 수 있으므로 같은 시간 제한 적용
+            await asyncio.wait_for(websocket.close(code=1008), timeout=MJPEG_SEND_TIMEOUT)
+        except Exception:
+            pass
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("❌ WebSocket 스트림 오류: %s", e)
+    finally:
+        mjpeg_manager.remove_viewer(frame_queue)
+
+# 스트림 메타 정보 최소 전송 간격 (프레임마다 보내지 않고 그 사이 변경을 모아서 전송)과,
+# 변경이 없어도 한 번씩 보내는 주기 (초 - 끊긴 연결 감지용)
+STREAM_META_MIN_INTERVAL = 0.5
+STREAM_META_KEEPALIVE = 15.0
+
+@app.websocket("/ws/meta")
+async def stream_meta_websocket(websocket: WebSocket):
+    """스트림 시청자 수/프레임 수/ESP Eye 상태 WebSocket (매니저가 값이 바뀔 때 알림 - 대시보드 폴링 대체)"""
+    await websocket.accept()
+    
+    manager = mjpeg_manager
+    version = None  # 연결 직후 현재 값 전송
+    try:
+        while True:
+            if version == manager.meta_version:
+                try:
+                    await asyncio.wait_for(manager.meta_changed.wait(), timeout=STREAM_META_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # 변경이 없어도 현재 값을 다시 보내 끊긴 연결 감지
+                    await websocket.send_text(json_dumps(manager.get_meta()).decode())
+                    continue
+            version = manager.meta_version
+            await websocket.send_text(json_dumps(manager.get_meta()).decode())
+            await asyncio.sleep(STREAM_META_MIN_INTERVAL)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("❌ 스트림 메타 WebSocket 오류: %s", e)
+
 # 🔥 추가 디버깅 엔드포인트
-@app.get("/stream/debug")
+@app.get("/stream/debug", response_class=DefaultJSONResponse)
 def debug_stream():
     """스트림 디버깅 정보"""
     try:
+        # mjpeg_manager는 모듈 로드 시 항상 생성되므로 존재/메서드 확인 불필요
+        latest_frame = mjpeg_manager.latest_frame
         manager_info = {
-            "mjpeg_manager_exists": 'mjpeg_manager' in globals(),
-            "mjpeg_manager_type": str(type(mjpeg_manager)) if 'mjpeg_manager' in globals() else "Not found",
-            "has_add_viewer": hasattr(mjpeg_manager, 'add_viewer') if 'mjpeg_manager' in globals() else False,
-            "has_latest_frame": hasattr(mjpeg_manager, 'latest_frame') and mjpeg_manager.latest_frame is not None if 'mjpeg_manager' in globals() else False,
+            "mjpeg_manager_exists": True,
+            "mjpeg_manager_type": MJPEG_MANAGER_TYPE,
+            "has_add_viewer": True,
+            "has_latest_frame": latest_frame is not None,
             "modules_available": MODULES_AVAILABLE,
+            "stats": mjpeg_manager.get_stats(),
+            "latest_frame_size": len(latest_frame) if latest_frame else 0
         }
         
-        if 'mjpeg_manager' in globals() and hasattr(mjpeg_manager, 'get_stats'):
-            stats = mjpeg_manager.get_stats()
-            manager_info.update({
-                "stats": stats,
-                "latest_frame_size": len(mjpeg_manager.latest_frame) if mjpeg_manager.latest_frame else 0
-            })
-        
-        return {
+        # 응답 객체를 직접 반환 - jsonable_encoder 변환 없이 바로 직렬화
+        return DefaultJSONResponse({
             "debug_info": manager_info,
-            "timestamp": get_korea_time().isoformat()
-        }
+            "timestamp": current_korea_timestamp()
+        })
         
     except Exception as e:
-        return {
+        return DefaultJSONResponse({
             "error": str(e),
-            "timestamp": get_korea_time().isoformat()
-        }
+            "timestamp": current_korea_timestamp()
+        })
 
 # 🔥 간단한 테스트 스트림 (비교용)
+# 더미 JPEG 데이터 (최소한의 유효한 JPEG)
+TEST_DUMMY_JPEG = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01,
+    0x01, 0x01, 0x00, 0x48, 0x00, 0x48, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43,
+    0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09,
+    0x09, 0x08, 0x0A, 0x0C, 0x14, 0x0D, 0x0C, 0x0B, 0x0B, 0x0C, 0x19, 0x12,
+    0x13, 0x0F, 0x14, 0x1D, 0x1A, 0x1F, 0x1E, 0x1D, 0x1A, 0x1C, 0x1C, 0x20,
+    0x24, 0x2E, 0x27, 0x20, 0x22, 0x2C, 0x23, 0x1C, 0x1C, 0x28, 0x37, 0x29,
+    0x2C, 0x30, 0x31, 0x34, 0x34, 0x34, 0x1F, 0x27, 0x39, 0x3D, 0x38, 0x32,
+    0x3C, 0x2E, 0x33, 0x34, 0x32, 0xFF, 0xC0, 0x00, 0x11, 0x08, 0x00, 0x01,
+    0x00, 0x01, 0x01, 0x01, 0x11, 0x00, 0x02, 0x11, 0x01, 0x03, 0x11, 0x01,
+    0xFF, 0xC4, 0x00, 0x14, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x08, 0xFF, 0xC4,
+    0x00, 0x14, 0x10, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xFF, 0xDA, 0x00, 0x0C,
+    0x03, 0x01, 0x00, 0x02, 0x11, 0x03, 0x11, 0x00, 0x3F, 0x00, 0xB2, 0xC0,
+    0x07, 0xFF, 0xD9
+])
+
+# 테스트 스트림 MJPEG 프레임 (내용이 고정이므로 한 번만 생성)
+TEST_MJPEG_FRAME = mjpeg_part_header(len(TEST_DUMMY_JPEG)) + TEST_DUMMY_JPEG + MJPEG_PART_END
+
 @app.get("/stream/simple")
 def simple_test_stream():
     """간단한 테스트 스트림"""
     
-    def generate_simple():
-        print("🧪 간단한 테스트 스트림 시작")
-        
-        # 더미 JPEG 데이터 (최소한의 유효한 JPEG)
-        dummy_jpeg = bytes([
-            0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01,
-            0x01, 0x01, 0x00, 0x48, 0x00, 0x48, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43,
-            0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09,
-            0x09, 0x08, 0x0A, 0x0C, 0x14, 0x0D, 0x0C, 0x0B, 0x0B, 0x0C, 0x19, 0x12,
-            0x13, 0x0F, 0x14, 0x1D, 0x1A, 0x1F, 0x1E, 0x1D, 0x1A, 0x1C, 0x1C, 0x20,
-            0x24, 0x2E, 0x27, 0x20, 0x22, 0x2C, 0x23, 0x1C, 0x1C, 0x28, 0x37, 0x29,
-            0x2C, 0x30, 0x31, 0x34, 0x34, 0x34, 0x1F, 0x27, 0x39, 0x3D, 0x38, 0x32,
-            0x3C, 0x2E, 0x33, 0x34, 0x32, 0xFF, 0xC0, 0x00, 0x11, 0x08, 0x00, 0x01,
-            0x00, 0x01, 0x01, 0x01, 0x11, 0x00, 0x02, 0x11, 0x01, 0x03, 0x11, 0x01,
-            0xFF, 0xC4, 0x00, 0x14, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x08, 0xFF, 0xC4,
-            0x00, 0x14, 0x10, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xFF, 0xDA, 0x00, 0x0C,
-            0x03, 0x01, 0x00, 0x02, 0x11, 0x03, 0x11, 0x00, 0x3F, 0x00, 0xB2, 0xC0,
-            0x07, 0xFF, 0xD9
-        ])
+    async def generate_simple():
+        """테스트 스트림 생성기 (이벤트 루프에서 대기 - 스레드 풀 점유 안 함)"""
+        logger.debug("🧪 간단한 테스트 스트림 시작")
         
         for i in range(100):  # 100프레임 전송
-            # MJPEG 프레임 형식
-            boundary = b"--frame\r\n"
-            content_type = b"Content-Type: image/jpeg\r\n"
-            content_length = f"Content-Length: {len(dummy_jpeg)}\r\n\r\n".encode()
-            frame_end = b"\r\n"
-            
-            frame = boundary + content_type + content_length + dummy_jpeg + frame_end
-            yield frame
+            yield TEST_MJPEG_FRAME
             
             if i % 10 == 0:
-                print(f"🧪 테스트 프레임 {i} 전송")
+                logger.debug("🧪 테스트 프레임 %s 전송", i)
             
-            import time
-            time.sleep(0.1)  # 10 FPS
+            await asyncio.sleep(0.1)  # 10 FPS
         
-        print("🧪 테스트 스트림 종료")
+        logger.debug("🧪 테스트 스트림 종료")
     
     return StreamingResponse(
         generate_simple(),
@@ -764,10 +1264,8 @@ def simple_test_stream():
     )
 
 # 🔥 스트림 테스트 페이지 개선
-@app.get("/stream/test")
-def enhanced_test_page():
-    """향상된 스트림 테스트 페이지"""
-    html = """
+# 스트림 테스트 페이지 (동적 값 없음 - 시작 시 한 번만 인코딩)
+STREAM_TEST_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -854,103 +1352,33 @@ def enhanced_test_page():
         </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """.encode("utf-8")
+STREAM_TEST_HTML_GZ = gzip.compress(STREAM_TEST_HTML, compresslevel=9)
+
+@app.get("/stream/test")
+def enhanced_test_page(request: Request):
+    """향상된 스트림 테스트 페이지"""
+    return static_html_response(request, STREAM_TEST_HTML, STREAM_TEST_HTML_GZ)
 
 # 🔥 스트림 상태 확인
-@app.get("/stream/status")
+@app.get("/stream/status", response_class=DefaultJSONResponse)
 def get_stream_status():
-    """MJPEG 스트리밍 상태 조회"""
+    """MJPEG 스트리밍 상태 조회 (테스트/설정 페이지가 3초마다 폴링)"""
     stats = mjpeg_manager.get_stats()
     
-    return {
+    return DefaultJSONResponse({
         "status": "active" if stats["viewers"] > 0 or stats.get("esp_eye_connected", False) else "inactive",
         "viewers": stats["viewers"],
         "frame_count": stats["frame_count"],
+        "dropped_frames": stats.get("dropped_frames", 0),
+        "frames_sent": stats.get("frames_sent", 0),
         "last_frame_time": stats.get("last_frame_time"),
         "last_frame_age_seconds": stats.get("last_frame_age"),
         "esp_eye_connected": stats.get("esp_eye_connected", False),
         "stream_url": "/stream",
         "has_latest_frame": stats.get("has_latest_frame", False),
-        "timestamp": get_korea_time().isoformat()
-    }
-
-# 🔥 간단한 테스트 페이지
-@app.get("/stream/test")
-def test_stream_page():
-    """스트림 테스트 페이지"""
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>MJPEG 스트림 테스트</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; text-align: center; }
-            img { border: 2px solid #333; border-radius: 10px; max-width: 90%; }
-            .info { background: #f0f0f0; padding: 15px; margin: 15px 0; border-radius: 5px; }
-        </style>
-    </head>
-    <body>
-        <h1>🎥 Baby Monitor MJPEG 스트림</h1>
-        
-        <div class="info">
-            <div id="status">연결 중...</div>
-            <div>시간: <span id="time"></span></div>
-        </div>
-        
-        <div>
-            <img id="stream" src="/stream" alt="MJPEG Stream" 
-                 onerror="showError()" onload="showSuccess()">
-        </div>
-        
-        <script>
-            function updateTime() {
-                document.getElementById('time').textContent = new Date().toLocaleString();
-            }
-            
-            function showError() {
-                document.getElementById('status').innerHTML = '❌ 스트림 연결 실패';
-            }
-            
-            function showSuccess() {
-                document.getElementById('status').innerHTML = '✅ 스트림 연결 성공';
-            }
-            
-            setInterval(updateTime, 1000);
-            updateTime();
-            
-            // 3초마다 상태 확인
-            setInterval(async () => {
-                try {
-                    const response = await fetch('/stream/status');
-                    const data = await response.json();
-                    document.getElementById('status').innerHTML = 
-                        `📺 시청자: ${data.viewers} | 프레임: ${data.frame_count} | ESP Eye: ${data.esp_eye_connected ? '✅' : '❌'}`;
-                } catch (e) {
-                    // 오류 무시
-                }
-            }, 3000);
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html)
-
-@app.get("/stream/status")
-def get_stream_status():
-    """MJPEG 스트리밍 상태 조회"""
-    stats = mjpeg_manager.get_stats()
-    
-    return {
-        "status": "active" if stats["viewers"] > 0 or stats["esp_eye_connected"] else "inactive",
-        "viewers": stats["viewers"],
-        "frame_count": stats["frame_count"],
-        "last_frame_time": stats["last_frame_time"],
-        "last_frame_age_seconds": stats["last_frame_age"],
-        "esp_eye_connected": stats["esp_eye_connected"],
-        "stream_url": "/stream",
-        "timestamp": get_korea_time().isoformat()
-    }
+        "timestamp": current_korea_timestamp()
+    })
 
 @app.get("/app/stream/url")
 def get_app_stream_url():
@@ -959,28 +1387,26 @@ def get_app_stream_url():
     
     return {
         "status": "success",
-        "stream_url": "/stream",  # FastAPI 서버의 스트림 엔드포인트
+        "stream_url": "/stream",  # MJPEG 스트림 (<img> 태그 등 기존 클라이언트용)
+        "ws_stream_url": "/ws/stream",  # JPEG 바이너리 WebSocket 스트림 (앱 권장)
         "viewers": stats["viewers"],
         "streaming_active": stats["esp_eye_connected"],
         "frame_count": stats["frame_count"],
-        "timestamp": get_korea_time().isoformat()
+        "timestamp": current_korea_timestamp()
     }
 
 # 🔥 ESP Eye 설정 가이드 (수정된 버전)
-@app.get("/stream/setup", response_class=HTMLResponse)
-def mjpeg_setup_guide():
-    """ESP Eye MJPEG 설정 가이드"""
-    
-    # 현재 서버 정보 가져오기
-    stats = mjpeg_manager.get_stats()
-    
-    html_content = f"""
+# ESP Eye 설정 가이드 페이지 (서버 값 치환 없음 - 시작 시 한 번만 생성/인코딩)
+SETUP_GUIDE_HTML = f"""
     <!DOCTYPE html>
     <html>
     <head>
         <title>ESP Eye MJPEG 설정 가이드</title>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <!-- CDN 연결 미리 준비 (CSS/JS용 + 아이콘 폰트 CORS 요청용) -->
+        <link rel="preconnect" href="https://cdn.jsdelivr.net">
+        <link rel="preconnect" href="https://cdn.jsdelivr.net" crossorigin>
         <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
         <link href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.7.2/font/bootstrap-icons.css" rel="stylesheet">
     </head>
@@ -1166,29 +1592,25 @@ void loop() {{
         </script>
     </body>
     </html>
-    """
-    
-    return HTMLResponse(content=html_content)
+    """.encode("utf-8")
+SETUP_GUIDE_HTML = localize_vendor_assets(SETUP_GUIDE_HTML)
+SETUP_GUIDE_HTML_GZ = gzip.compress(SETUP_GUIDE_HTML, compresslevel=9)
 
-@app.post("/esp32/command")
-async def send_command_to_esp32(command_data: Dict[str, Any]):
-    """ESP32에 WiFi로 명령 전송"""
-    if not MODULES_AVAILABLE:
-        return {"error": "Modules not available", "command": command_data}
-    
-    try:
-        success = await esp32_handler.send_command_to_esp32(command_data)
-        
-        return {
-            "status": "success" if success else "failed",
-            "message": f"Command {'sent to' if success else 'failed to send to'} ESP32",
-            "command": command_data.get("command"),
-            "timestamp": datetime.now().isoformat(),
-            "esp32_ip": esp32_handler.esp32_ip
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Command sending failed: {str(e)}")
+# 정적 페이지이므로 내용 해시로 ETag를 한 번만 계산 (배포로 내용이 바뀌면 ETag도 바뀜)
+# gzip/원본 두 가지로 전송되므로 약한 ETag
+SETUP_GUIDE_ETAG = 'W/"%s"' % hashlib.sha1(SETUP_GUIDE_HTML).hexdigest()[:16]
+SETUP_GUIDE_HEADERS = {
+    "Cache-Control": "public, max-age=86400",
+    "ETag": SETUP_GUIDE_ETAG,
+}
+
+@app.get("/stream/setup", response_class=HTMLResponse)
+def mjpeg_setup_guide(request: Request):
+    """ESP Eye MJPEG 설정 가이드 (상태 값은 페이지가 /stream/status로 직접 조회)"""
+    # 브라우저 캐시와 같은 버전이면 본문 없이 304
+    if request.headers.get("if-none-match") == SETUP_GUIDE_ETAG:
+        return Response(status_code=304, headers={**SETUP_GUIDE_HEADERS, "Vary": "Accept-Encoding"})
+    return static_html_response(request, SETUP_GUIDE_HTML, SETUP_GUIDE_HTML_GZ, SETUP_GUIDE_HEADERS)
 
 @app.get("/test", response_class=HTMLResponse)
 def get_test_page():
@@ -1363,10 +1785,20 @@ def get_test_page():
             }}
         }}
         
-        // 페이지 로드 시 초기 상태 확인
-        window.onload = function() {{
+        // 페이지 로드 시 초기 상태 확인 (/bootstrap 한 번으로 health/status/root 함께 조회)
+        window.onload = async function() {{
             addLog('🍼 Baby Monitor Test Dashboard 시작');
-            getHealth();
+            try {{
+                const response = await fetch('/bootstrap');
+                const data = await response.json();
+                
+                addLog('🏥 Health: ' + data.health.status + ' - Redis: ' + data.health.redis + ', Modules: ' + data.health.modules_available);
+                addLog('📊 ESP32: ' + data.status.esp32.status + ', WebSocket 연결: ' + data.status.websocket.active_connections);
+                addLog('🏠 Root: ' + data.root.message + ' - Version: ' + data.root.version);
+                addLog('👶 아기 상태: ' + (data.baby_status.detected ? '감지됨' : '미감지') + ', 환경: ' + data.baby_status.environment_status);
+            }} catch (error) {{
+                addLog('❌ 초기 상태 조회 오류: ' + error.message);
+            }}
         }};
         </script>
     </body>
@@ -1374,15 +1806,23 @@ def get_test_page():
     """
     return HTMLResponse(content=html_content)
 
-@app.get("/dashboard", response_class=HTMLResponse)
-def baby_monitor_dashboard():
-    """아기 모니터링 실시간 대시보드 (MJPEG 스트리밍 통합)"""
-    
-    # 현재 아기 모니터링 데이터 수집
-    current_time = get_korea_time()
-    current_time_str = current_time.strftime("%Y년 %m월 %d일 %H:%M:%S")
-    time_only = current_time.strftime("%H:%M:%S")
-    date_only = current_time.strftime("%Y년 %m월 %d일")
+# 현재 상태 조회 캐시 TTL (초) - 짧은 시간 안의 대시보드 요청들이 Redis 조회 한 번을 공유
+STATUS_CACHE_TTL = 0.5
+_status_cache = {"t": 0.0, "v": None}
+_status_cache_lock = threading.Lock()
+
+def cached_current_status(ttl: float = STATUS_CACHE_TTL) -> Optional[Dict[str, Any]]:
+    """redis_manager.get_current_status() 결과를 짧게 캐시 (워커 스레드에서 호출 - 미스 시 한 스레드만 조회)"""
+    with _status_cache_lock:
+        now = time.monotonic()
+        if now - _status_cache["t"] < ttl and _status_cache["v"] is not None:
+            return _status_cache["v"]
+        value = redis_manager.get_current_status()
+        _status_cache.update(t=now, v=value)
+        return value
+
+def collect_baby_status() -> Dict[str, Any]:
+    """대시보드에 표시할 아기 상태 수집 (Redis 조회 - 블로킹)"""
     
     # Redis에서 최신 데이터 가져오기 (가능한 경우)
     baby_status = {
@@ -1395,13 +1835,10 @@ def baby_monitor_dashboard():
         "environment_status": "알 수 없음"
     }
     
-    recent_activities = []
-    alerts = []
-    
     # Redis 데이터 확인 (MODULES_AVAILABLE 체크)
     if MODULES_AVAILABLE and redis_manager.available:
         try:
-            current_data = redis_manager.get_current_status()
+            current_data = cached_current_status()
             if current_data:
                 baby_status.update({
                     "detected": current_data.get("baby_detected", False),
@@ -1420,878 +1857,292 @@ def baby_monitor_dashboard():
                     else:
                         baby_status["environment_status"] = "주의"
         except Exception as e:
-            print(f"Redis 데이터 조회 실패: {e}")
-    
-    # 상태에 따른 색상 결정
-    detection_color = "success" if baby_status["detected"] else "warning"
-    confidence_color = "success" if baby_status["confidence"] > 0.7 else "warning" if baby_status["confidence"] > 0.3 else "danger"
-    env_color = "success" if baby_status["environment_status"] == "최적" else "warning"
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>👶 Baby Monitor - 실시간 모니터링</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.7.2/font/bootstrap-icons.css" rel="stylesheet">
-        <style>
-            body {{ 
-                background: linear-gradient(135deg, #ffeaa7 0%, #fab1a0 50%, #e17055 100%);
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }}
-            .dashboard-container {{ 
-                background: rgba(255, 255, 255, 0.95); 
-                border-radius: 25px; 
-                box-shadow: 0 25px 50px rgba(0,0,0,0.15);
-                backdrop-filter: blur(10px);
-            }}
-            .baby-card {{ 
-                border: none; 
-                border-radius: 20px; 
-                transition: all 0.3s ease;
-                background: linear-gradient(145deg, #ffffff, #f8f9fa);
-                box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-            }}
-            .baby-card:hover {{ transform: translateY(-8px) scale(1.02); }}
-            .live-indicator {{ 
-                display: inline-block; 
-                width: 12px; 
-                height: 12px; 
-                background: #ff6b6b; 
-                border-radius: 50%; 
-                animation: pulse 2s infinite;
-            }}
-            @keyframes pulse {{
-                0% {{ opacity: 1; transform: scale(1); }}
-                50% {{ opacity: 0.5; transform: scale(1.1); }}
-                100% {{ opacity: 1; transform: scale(1); }}
-            }}
-            .video-container {{ 
-                background: #000; 
-                border-radius: 15px; 
-                position: relative;
-                min-height: 400px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                overflow: hidden;
-            }}
-            .stream-overlay {{ 
-                position: absolute; 
-                top: 10px; 
-                left: 10px; 
-                background: rgba(0,0,0,0.8); 
-                color: white; 
-                padding: 8px 12px; 
-                border-radius: 15px; 
-                font-size: 12px;
-                z-index: 10;
-            }}
-            .viewer-count {{ 
-                position: absolute; 
-                top: 10px; 
-                right: 10px; 
-                background: rgba(0,0,0,0.8); 
-                color: white; 
-                padding: 8px 12px; 
-                border-radius: 15px; 
-                font-size: 12px;
-                z-index: 10;
-            }}
-            .stream-status-indicator {{
-                display: inline-block;
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                margin-right: 5px;
-            }}
-            .status-online {{ background-color: #28a745; }}
-            .status-offline {{ background-color: #dc3545; }}
-            .status-loading {{ background-color: #ffc107; }}
-            .status-badge {{ 
-                font-size: 1.1rem; 
-                padding: 8px 16px;
-                border-radius: 20px;
-            }}
-            .metric-card {{ 
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                color: white; 
-                border-radius: 20px;
-                transition: transform 0.3s ease;
-            }}
-            .metric-card:hover {{ transform: scale(1.05); }}
-            .baby-icon {{ font-size: 3rem; }}
-            .activity-item {{ 
-                background: white; 
-                border-radius: 15px; 
-                border-left: 4px solid #667eea;
-                transition: all 0.3s ease;
-            }}
-            .activity-item:hover {{ transform: translateX(10px); }}
-            .refresh-controls {{ 
-                position: fixed; 
-                top: 20px; 
-                right: 20px; 
-                z-index: 1000;
-            }}
-            .stream-error {{
-                text-align: center;
-                color: white;
-                padding: 40px 20px;
-            }}
-            .stream-loading {{
-                text-align: center;
-                color: white;
-                padding: 40px 20px;
-            }}
-            .mjpeg-stream {{
-                width: 100%;
-                height: 100%;
-                object-fit: contain;
-                border-radius: 15px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container-fluid py-4">
-            
-            <!-- 새로고침 컨트롤 -->
-            <div class="refresh-controls">
-                <button class="btn btn-primary btn-sm me-2" onclick="refreshData()">
-                    <i class="bi bi-arrow-clockwise"></i> 새로고침
-                </button>
-                <button class="btn btn-outline-primary btn-sm me-2" onclick="toggleStreamMode()">
-                    <i class="bi bi-camera-video"></i> <span id="streamModeText">스트림 모드</span>
-                </button>
-                <div class="form-check form-switch d-inline-block">
-                    <input class="form-check-input" type="checkbox" id="autoRefresh" checked>
-                    <label class="form-check-label text-white" for="autoRefresh">자동 새로고침</label>
-                </div>
-            </div>
-            
-            <div class="dashboard-container mx-auto p-4" style="max-width: 1400px;">
-                
-                <!-- 헤더 -->
-                <div class="text-center mb-4">
-                    <h1 class="display-4 text-primary mb-2">
-                        <i class="bi bi-heart-fill text-danger"></i> Baby Monitor
-                    </h1>
-                    <p class="lead text-muted">실시간 아기 모니터링 대시보드</p>
-                    <div class="d-flex justify-content-center align-items-center">
-                        <span class="live-indicator me-2"></span>
-                        <span class="text-success fw-bold">LIVE</span>
-                        <span class="ms-3 text-muted">{current_time.strftime("%Y-%m-%d %H:%M:%S")}</span>
-                    </div>
-                </div>
-                
-                <div class="row">
-                    
-                    <!-- 🔥 메인 비디오/이미지 영역 (MJPEG 스트림 통합) -->
-                    <div class="col-lg-8 mb-4">
-                        <div class="baby-card h-100">
-                            <div class="card-header bg-primary text-white">
-                                <h5 class="mb-0">
-                                    <i class="bi bi-camera-video"></i> 실시간 영상
-                                    <span class="float-end">
-                                        <span class="stream-status-indicator status-loading" id="streamStatusIndicator"></span>
-                                        <span id="streamStatusText">연결 중...</span>
-                                    </span>
-                                </h5>
-                            </div>
-                            <div class="card-body p-0">
-                                <div class="video-container" id="videoContainer">
-                                    
-                                    <!-- 🔥 MJPEG 스트림 뷰 -->
-                                    <div id="mjpegStreamView" style="width: 100%; height: 100%; position: relative;">
-                                        <img id="mjpegStream" 
-                                             src="/stream" 
-                                             alt="Live MJPEG Stream" 
-                                             class="mjpeg-stream"
-                                             onerror="handleStreamError()"
-                                             onload="handleStreamSuccess()">
-                                        
-                                        <!-- 스트림 상태 오버레이 -->
-                                        <div class="stream-overlay">
-                                            <span class="live-indicator"></span> LIVE STREAM
-                                        </div>
-                                        
-                                        <!-- 시청자 수 표시 -->
-                                        <div class="viewer-count">
-                                            <i class="bi bi-eye"></i> <span id="viewerCount">-</span>명 시청 중
-                                        </div>
-                                    </div>
-                                    
-                                    <!-- 🔥 이미지 모드 뷰 (폴백) -->
-                                    <div id="imageView" style="display: none; width: 100%; height: 100%; position: relative;">
-                                        <img id="latestImage" src="" alt="최신 이미지" class="mjpeg-stream">
-                                        <div class="stream-overlay">
-                                            <i class="bi bi-image"></i> 최신 이미지
-                                        </div>
-                                        <div class="viewer-count">
-                                            <span id="imageTimestamp">--:--</span>
-                                        </div>
-                                    </div>
-                                    
-                                    <!-- 🔥 스트림 로딩 뷰 -->
-                                    <div id="streamLoadingView" class="stream-loading" style="display: none;">
-                                        <div class="spinner-border text-light mb-3" role="status">
-                                            <span class="visually-hidden">Loading...</span>
-                                        </div>
-                                        <h5>스트림 연결 중...</h5>
-                                        <p>ESP Eye 카메라와 연결을 시도하고 있습니다</p>
-                                    </div>
-                                    
-                                    <!-- 🔥 스트림 오류 뷰 -->
-                                    <div id="streamErrorView" class="stream-error" style="display: none;">
-                                        <i class="bi bi-camera-video-off baby-icon mb-3"></i>
-                                        <h5>스트림 연결 실패</h5>
-                                        <p class="mb-3">ESP Eye 카메라가 연결되지 않았습니다</p>
-                                        <div class="d-grid gap-2 col-6 mx-auto">
-                                            <button class="btn btn-outline-light" onclick="retryStream()">
-                                                <i class="bi bi-arrow-clockwise"></i> 다시 연결
-                                            </button>
-                                            <button class="btn btn-outline-info" onclick="switchToImageMode()">
-                                                <i class="bi bi-image"></i> 이미지 모드로 전환
-                                            </button>
-                                        </div>
-                                    </div>
-                                </div>
-                                
-                                <!-- 영상 컨트롤 -->
-                                <div class="p-3 bg-light">
-                                    <div class="row text-center">
-                                        <div class="col-3">
-                                            <button class="btn btn-outline-primary btn-sm w-100" onclick="captureSnapshot()">
-                                                <i class="bi bi-camera"></i> 스냅샷
-                                            </button>
-                                        </div>
-                                        <div class="col-3">
-                                            <button class="btn btn-outline-success btn-sm w-100" onclick="toggleRecording()">
-                                                <i class="bi bi-record-circle"></i> <span id="recordText">녹화</span>
-                                            </button>
-                                        </div>
-                                        <div class="col-3">
-                                            <button class="btn btn-outline-warning btn-sm w-100" onclick="toggleNightMode()">
-                                                <i class="bi bi-moon"></i> 야간모드
-                                            </button>
-                                        </div>
-                                        <div class="col-3">
-                                            <button class="btn btn-outline-info btn-sm w-100" onclick="openFullscreen()">
-                                                <i class="bi bi-fullscreen"></i> 전체화면
-                                            </button>
-                                        </div>
-                                    </div>
-                                    
-                                    <!-- 스트림 상태 정보 -->
-                                    <div class="mt-2 d-flex justify-content-between align-items-center">
-                                        <small class="text-muted">
-                                            <span id="streamModeDisplay">MJPEG 스트림</span> | 
-                                            프레임: <span id="frameCount">0</span>
-                                        </small>
-                                        <div>
-                                            <span class="badge bg-secondary me-1" id="streamQuality">HD</span>
-                                            <span class="badge" id="connectionStatus">연결 중</span>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <!-- 아기 상태 정보 (기존과 동일) -->
-                    <div class="col-lg-4 mb-4">
-                        <div class="baby-card h-100">
-                            <div class="card-header bg-success text-white">
-                                <h5 class="mb-0"><i class="bi bi-person-check"></i> 아기 상태</h5>
-                            </div>
-                            <div class="card-body">
-                                
-                                <!-- 감지 상태 -->
-                                <div class="text-center mb-4">
-                                    <div class="baby-icon text-{detection_color} mb-2">
-                                        <i class="bi bi-{'person-check' if baby_status['detected'] else 'person-x'}"></i>
-                                    </div>
-                                    <h4 class="text-{detection_color}">
-                                        {'아기 감지됨' if baby_status['detected'] else '아기 미감지'}
-                                    </h4>
-                                    <span class="status-badge bg-{detection_color}">
-                                        신뢰도: {baby_status['confidence']:.1%}
-                                    </span>
-                                </div>
-                                
-                                <!-- 상태 정보 -->
-                                <div class="list-group list-group-flush">
-                                    <div class="list-group-item d-flex justify-content-between align-items-center">
-                                        <span><i class="bi bi-clock"></i> 마지막 감지</span>
-                                        <small class="text-muted">{baby_status['last_seen']}</small>
-                                    </div>
-                                    <div class="list-group-item d-flex justify-content-between align-items-center">
-                                        <span><i class="bi bi-moon"></i> 수면 시간</span>
-                                        <span class="badge bg-info">{baby_status['sleep_duration']}</span>
-                                    </div>
-                                    <div class="list-group-item d-flex justify-content-between align-items-center">
-                                        <span><i class="bi bi-shield-check"></i> 안전 상태</span>
-                                        <span class="badge bg-success">안전</span>
-                                    </div>
-                                </div>
-                                
-                                <!-- 빠른 액션 -->
-                                <div class="mt-3">
-                                    <h6>빠른 액션</h6>
-                                    <div class="d-grid gap-2">
-                                        <button class="btn btn-outline-primary btn-sm" onclick="playLullaby()">
-                                            <i class="bi bi-music-note"></i> 자장가 재생
-                                        </button>
-                                        <button class="btn btn-outline-warning btn-sm" onclick="sendAlert()">
-                                            <i class="bi bi-bell"></i> 알림 보내기
-                                        </button>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- 환경 데이터 & 활동 로그 (기존과 동일) -->
-                <div class="row">
-                    
-                    <!-- 환경 센서 데이터 -->
-                    <div class="col-lg-6 mb-4">
-                        <div class="baby-card">
-                            <div class="card-header bg-info text-white">
-                                <h5 class="mb-0"><i class="bi bi-thermometer"></i> 환경 센서</h5>
-                            </div>
-                            <div class="card-body">
-                                <div class="row">
-                                    <div class="col-6">
-                                        <div class="metric-card p-4 text-center mb-3">
-                                            <i class="bi bi-thermometer-high" style="font-size: 2rem;"></i>
-                                            <h3 class="mt-2">{baby_status['temperature']}°C</h3>
-                                            <p class="mb-0">온도</p>
-                                        </div>
-                                    </div>
-                                    <div class="col-6">
-                                        <div class="metric-card p-4 text-center mb-3">
-                                            <i class="bi bi-droplet" style="font-size: 2rem;"></i>
-                                            <h3 class="mt-2">{baby_status['humidity']}%</h3>
-                                            <p class="mb-0">습도</p>
-                                        </div>
-                                    </div>
-                                </div>
-                                
-                                <div class="text-center">
-                                    <span class="status-badge bg-{env_color}">
-                                        <i class="bi bi-{'check-circle' if baby_status['environment_status'] == '최적' else 'exclamation-triangle'}"></i>
-                                        환경 상태: {baby_status['environment_status']}
-                                    </span>
-                                </div>
-                                
-                                <!-- 환경 권장사항 -->
-                                <div class="mt-3 p-3 bg-light rounded">
-                                    <h6><i class="bi bi-lightbulb"></i> 권장사항</h6>
-                                    <ul class="mb-0 small">
-                                        <li>적정 온도: 20-24°C</li>
-                                        <li>적정 습도: 40-60%</li>
-                                        <li>통풍이 잘 되는 환경 유지</li>
-                                    </ul>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <!-- 활동 로그 -->
-                    <div class="col-lg-6 mb-4">
-                        <div class="baby-card">
-                            <div class="card-header bg-warning text-dark">
-                                <h5 class="mb-0"><i class="bi bi-list-ul"></i> 최근 활동</h5>
-                            </div>
-                            <div class="card-body">
-                                <div class="activity-log" style="max-height: 300px; overflow-y: auto;">
-                                    
-                                    <div class="activity-item p-3 mb-2">
-                                        <div class="d-flex justify-content-between align-items-center">
-                                            <div>
-                                                <i class="bi bi-person-check text-success"></i>
-                                                <strong>아기 감지됨</strong>
-                                            </div>
-                                            <small class="text-muted">{current_time.strftime("%H:%M")}</small>
-                                        </div>
-                                        <small class="text-muted">신뢰도 85% | 안전한 자세</small>
-                                    </div>
-                                    
-                                    <div class="activity-item p-3 mb-2">
-                                        <div class="d-flex justify-content-between align-items-center">
-                                            <div>
-                                                <i class="bi bi-thermometer text-info"></i>
-                                                <strong>환경 데이터 업데이트</strong>
-                                            </div>
-                                            <small class="text-muted">{(current_time.replace(minute=current_time.minute-2) if current_time.minute >= 2 else current_time.replace(hour=current_time.hour-1, minute=current_time.minute+58)).strftime("%H:%M")}</small>
-                                        </div>
-                                        <small class="text-muted">온도: 22.5°C | 습도: 55%</small>
-                                    </div>
-                                    
-                                    <div class="activity-item p-3 mb-2">
-                                        <div class="d-flex justify-content-between align-items-center">
-                                            <div>
-                                                <i class="bi bi-moon text-primary"></i>
-                                                <strong>수면 시작</strong>
-                                            </div>
-                                            <small class="text-muted">{(current_time.replace(hour=current_time.hour-2) if current_time.hour >= 2 else current_time.replace(hour=current_time.hour+22, minute=0)).strftime("%H:%M")}</small>
-                                        </div>
-                                        <small class="text-muted">평온한 수면 상태</small>
-                                    </div>
-                                    
-                                    <div class="text-center mt-3">
-                                        <button class="btn btn-outline-secondary btn-sm">
-                                            <i class="bi bi-clock-history"></i> 전체 기록 보기
-                                        </button>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- 빠른 통계 (기존과 동일) -->
-                <div class="row">
-                    <div class="col-12">
-                        <div class="baby-card">
-                            <div class="card-header bg-secondary text-white">
-                                <h5 class="mb-0"><i class="bi bi-graph-up"></i> 오늘의 요약</h5>
-                            </div>
-                            <div class="card-body">
-                                <div class="row text-center">
-                                    <div class="col-md-3">
-                                        <div class="metric-card p-3 h-100">
-                                            <i class="bi bi-moon" style="font-size: 2rem;"></i>
-                                            <h4 class="mt-2">8시간 30분</h4>
-                                            <p class="mb-0">총 수면시간</p>
-                                        </div>
-                                    </div>
-                                    <div class="col-md-3">
-                                        <div class="metric-card p-3 h-100">
-                                            <i class="bi bi-eye" style="font-size: 2rem;"></i>
-                                            <h4 class="mt-2">247회</h4>
-                                            <p class="mb-0">감지 횟수</p>
-                                        </div>
-                                    </div>
-                                    <div class="col-md-3">
-                                        <div class="metric-card p-3 h-100">
-                                            <i class="bi bi-exclamation-triangle" style="font-size: 2rem;"></i>
-                                            <h4 class="mt-2">0회</h4>
-                                            <p class="mb-0">알림 발생</p>
-                                        </div>
-                                    </div>
-                                    <div class="col-md-3">
-                                        <div class="metric-card p-3 h-100">
-                                            <i class="bi bi-heart-pulse" style="font-size: 2rem;"></i>
-                                            <h4 class="mt-2">98%</h4>
-                                            <p class="mb-0">안전 지수</p>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-        <script>
-            // 🔥 스트리밍 관련 변수들
-            let autoRefreshInterval;
-            let imageRefreshInterval;
-            let streamStatsInterval;
-            let currentMode = 'stream'; // 'stream' 또는 'image'
-            let isRecording = false;
-            let lastImageTimestamp = null;
-            let streamRetryCount = 0;
-            const maxRetryCount = 3;
-    
-            function refreshData() {{
-                window.location.reload();
-            }}
-    
-            // 🔥 MJPEG 스트림 관리 함수들
-            function handleStreamSuccess() {{
-                console.log('✅ MJPEG 스트림 연결 성공');
-                updateStreamStatus('online', 'LIVE');
-                document.getElementById('mjpegStreamView').style.display = 'block';
-                document.getElementById('streamErrorView').style.display = 'none';
-                document.getElementById('streamLoadingView').style.display = 'none';
-                streamRetryCount = 0;
-                
-                // 스트림 통계 업데이트 시작
-                startStreamStatsUpdate();
-            }}
-    
-            function handleStreamError() {{
-                console.log('❌ MJPEG 스트림 연결 실패');
-                updateStreamStatus('offline', '연결 실패');
-                
-                streamRetryCount++;
-                if (streamRetryCount < maxRetryCount) {{
-                    console.log(`🔄 스트림 재연결 시도 (${{streamRetryCount}}/${{maxRetryCount}})`);
-                    setTimeout(retryStream, 2000 * streamRetryCount); // 지수 백오프
-                }} else {{
-                    document.getElementById('mjpegStreamView').style.display = 'none';
-                    document.getElementById('streamErrorView').style.display = 'block';
-                    document.getElementById('streamLoadingView').style.display = 'none';
-                    
-                    // 이미지 모드로 자동 폴백 (옵션)
-                    setTimeout(() => {{
-                        if (confirm('스트림 연결에 실패했습니다. 이미지 모드로 전환하시겠습니까?')) {{
-                            switchToImageMode();
-                        }}
-                    }}, 3000);
-                }}
-            }}
-    
-            function retryStream() {{
-                console.log('🔄 스트림 재연결 시도');
-                updateStreamStatus('loading', '재연결 중...');
-                
-                document.getElementById('streamErrorView').style.display = 'none';
-                document.getElementById('streamLoadingView').style.display = 'block';
-                
-                const streamImg = document.getElementById('mjpegStream');
-                streamImg.src = '/stream?' + new Date().getTime(); // 캐시 방지
-            }}
-    
-            function updateStreamStatus(status, text) {{
-                const indicator = document.getElementById('streamStatusIndicator');
-                const statusText = document.getElementById('streamStatusText');
-                const connectionStatus = document.getElementById('connectionStatus');
-                
-                // 상태 표시기 업데이트
-                indicator.className = `stream-status-indicator status-${{status}}`;
-                statusText.textContent = text;
-                
-                // 연결 상태 배지 업데이트
-                switch(status) {{
-                    case 'online':
-                        connectionStatus.className = 'badge bg-success';
-                        connectionStatus.textContent = '연결됨';
-                        break;
-                    case 'offline':
-                        connectionStatus.className = 'badge bg-danger';
-                        connectionStatus.textContent = '연결 안됨';
-                        break;
-                    case 'loading':
-                        connectionStatus.className = 'badge bg-warning';
-                        connectionStatus.textContent = '연결 중';
-                        break;
-                }}
-            }}
-    
-            // 🔥 스트림 통계 업데이트
-            async function startStreamStatsUpdate() {{
-                if (streamStatsInterval) {{
-                    clearInterval(streamStatsInterval);
-                }}
-                
-                streamStatsInterval = setInterval(async () => {{
-                    try {{
-                        const response = await fetch('/stream/status');
-                        const data = await response.json();
-                        
-                        // 시청자 수 업데이트
-                        document.getElementById('viewerCount').textContent = data.viewers || 0;
-                        
-                        // 프레임 수 업데이트
-                        document.getElementById('frameCount').textContent = data.frame_count || 0;
-                        
-                        // ESP Eye 연결 상태 확인
-                        if (!data.esp_eye_connected && currentMode === 'stream') {{
-                            console.log('⚠️ ESP Eye 연결 끊김 감지');
-                            updateStreamStatus('offline', 'ESP Eye 연결 끊김');
-                        }}
-                        
-                    }} catch (error) {{
-                        console.error('📊 스트림 통계 업데이트 실패:', error);
-                    }}
-                }}, 5000);
-            }}
+            logger.warning("⚠️ Redis 데이터 조회 실패: %s", e)
     
-            // 🔥 모드 전환 함수들
-            function toggleStreamMode() {{
-                if (currentMode === 'stream') {{
-                    switchToImageMode();
-                }} else {{
-                    switchToStreamMode();
-                }}
-            }}
-    
-            function switchToStreamMode() {{
-                console.log('📺 스트림 모드로 전환');
-                currentMode = 'stream';
-                
-                document.getElementById('mjpegStreamView').style.display = 'block';
-                document.getElementById('imageView').style.display = 'none';
-                document.getElementById('streamModeText').textContent = '이미지 모드';
-                document.getElementById('streamModeDisplay').textContent = 'MJPEG 스트림';
-                
-                // 이미지 새로고침 중지
-                if (imageRefreshInterval) {{
-                    clearInterval(imageRefreshInterval);
-                }}
-                
-                // 스트림 재시작
-                retryStream();
-            }}
+    return baby_status
+
+def collect_server_status() -> Dict[str, Any]:
+    """보고서 페이지에 표시할 서버 상태 수집 (이미지 메타데이터는 Redis 조회 - 블로킹)"""
+    server_status = {
+        "redis_connected": redis_manager.available if MODULES_AVAILABLE else False,
+        "esp32_status": esp32_handler.esp32_status,
+        "active_connections": len(websocket_manager.active_connections) if MODULES_AVAILABLE else 0,
+        "last_image": "정보 없음",
+    }
     
-            function switchToImageMode() {{
-                console.log('🖼️ 이미지 모드로 전환');
-                currentMode = 'image';
-                
-                document.getElementById('mjpegStreamView').style.display = 'none';
-                document.getElementById('imageView').style.display = 'block';
-                document.getElementById('streamErrorView').style.display = 'none';
-                document.getElementById('streamLoadingView').style.display = 'none';
-                document.getElementById('streamModeText').textContent = '스트림 모드';
-                document.getElementById('streamModeDisplay').textContent = '이미지 모드';
-                
-                // 스트림 통계 업데이트 중지
-                if (streamStatsInterval) {{
-                    clearInterval(streamStatsInterval);
-                }}
-                
-                // 이미지 새로고침 시작
-                requestLatestImage();
-                setupImageAutoRefresh();
-                
-                updateStreamStatus('offline', '이미지 모드');
-            }}
+    if MODULES_AVAILABLE:
+        try:
+            image_meta = redis_manager.get_latest_image_meta()
+            if image_meta:
+                server_status["last_image"] = image_meta.get("timestamp", "알 수 없음")
+        except Exception:
+            pass
     
-            // 🔥 이미지 모드 함수들 (기존 코드 개선)
-            async function requestLatestImage() {{
-                try {{
-                    console.log('📷 최신 이미지 요청 중...');
-        
-                    const response = await fetch('/images/latest');
-                    const data = await response.json();
-        
-                    if (data.status === 'success' && data.has_image && data.image_base64) {{
-                        const base64Data = data.image_base64.trim();
-            
-                        if (base64Data.length > 0) {{
-                            displayImage(base64Data, data.timestamp);
-                            console.log('✅ 이미지 로드 성공:', data.size + ' bytes');
-                        }} else {{
-                            console.log('⚠️ 빈 이미지 데이터');
-                        }}
-                    }} else {{
-                        console.log('⚠️ 이미지 없음:', data.message || 'Unknown error');
-                    }}
-        
-                }} catch (error) {{
-                    console.error('❌ 이미지 요청 실패:', error);
-                }}
-            }}
+    return server_status
+
+def collect_event_status() -> Dict[str, Any]:
+    """/events로 보내는 전체 상태 (대시보드는 아기 상태, 보고서는 서버 상태 필드를 사용)"""
+    return {**collect_baby_status(), **collect_server_status()}
+
+# /events 상태 조회 주기와 변경이 없을 때 keep-alive 주석 전송 주기 (초)
+DASHBOARD_EVENT_INTERVAL = 1.0
+DASHBOARD_KEEPALIVE_INTERVAL = 15.0
+SSE_KEEPALIVE = b": keepalive\n\n"
+DASHBOARD_ACTIVITY_LIMIT = 50  # 서버가 보관하는 최근 활동 수
+
+class DashboardEvents:
+    """/events 구독자(대시보드/보고서)에게 상태 변경분을 전달 (이벤트 루프 스레드에서만 사용)
+
+    구독자 수와 관계없이 하나의 작업이 초당 한 번만 Redis를 조회하고,
+    바뀐 필드만 담은 이벤트를 한 번 만들어 모든 구독자가 공유.
+    최근 활동은 데이터 수신 시 링 버퍼에 쌓고 새 항목만 "activity" 이벤트로 전송
+    """
     
-            function displayImage(base64Data, timestamp) {{
-                const latestImage = document.getElementById('latestImage');
-                const timestampElement = document.getElementById('imageTimestamp');
-
-                try {{
-                    let imageUrl;
-                    if (base64Data.startsWith('data:')) {{
-                        imageUrl = base64Data;
-                    }} else {{
-                        imageUrl = 'data:image/jpeg;base64,' + base64Data;
-                    }}
-        
-                    const testImg = new Image();
-                    testImg.onload = function() {{
-                        console.log('✅ 이미지 표시 성공:', testImg.width + 'x' + testImg.height);
-                        latestImage.src = imageUrl;
+    def __init__(self):
+        self.subscribers = 0
+        self.version = 0
+        self.changed = asyncio.Event()
+        self.status: Dict[str, Any] = {}
+        self.last_event: bytes = b""  # 마지막으로 발행한 SSE 이벤트 (모든 구독자 공유)
+        self.poll_task: asyncio.Task = None
+        self.activities = deque(maxlen=DASHBOARD_ACTIVITY_LIMIT)  # 오래된 것부터
+        self._last_detected = None
+        self._last_environment = None
+    
+    def subscribe(self):
+        """구독자 추가 (첫 구독자가 생기면 조회 작업 시작 - 구독자가 없으면 스스로 종료)"""
+        self.subscribers += 1
+        if self.poll_task is None or self.poll_task.done():
+            self.poll_task = asyncio.create_task(self._poll_loop())
+    
+    def unsubscribe(self):
+        self.subscribers -= 1
+    
+    def snapshot_event(self) -> bytes:
+        """전체 상태 + 최근 활동 목록 SSE 이벤트 (새 구독자/변경분을 놓친 구독자용)"""
+        activity_list = b"event: activity_list\ndata: " + json_dumps(list(self.activities)) + b"\n\n"
+        if not self.status:
+            return activity_list
+        return b"data: " + json_dumps(self.status) + b"\n\n" + activity_list
+    
+    def _publish(self, event: bytes):
+        """이벤트를 발행하고 대기 중인 구독자를 한 번에 깨움"""
+        self.last_event = event
+        self.version += 1
+        self.changed.set()
+        self.changed.clear()
+    
+    def _add_activity(self, kind: str, title: str, detail: str):
+        item = {"time": get_korea_time().strftime("%H:%M"), "kind": kind, "title": title, "detail": detail}
+        self.activities.append(item)
+        if self.subscribers > 0:
+            self._publish(b"event: activity\ndata: " + json_dumps(item) + b"\n\n")
+    
+    def record_sensor_activity(self, data: Dict[str, Any]):
+        """ESP32 데이터에서 활동 기록 (감지 상태나 환경 값이 바뀐 경우만 - 같은 값 반복 수신은 무시)"""
+        if "baby_detected" in data:
+            detected = bool(data["baby_detected"])
+            if detected != self._last_detected:
+                self._last_detected = detected
+                confidence = data.get("confidence")
+                detail = f"신뢰도 {confidence:.0%}" if isinstance(confidence, (int, float)) else ""
+                self._add_activity("detect" if detected else "lost", "아기 감지됨" if detected else "아기 미감지", detail)
+        
+        if "temperature" in data or "humidity" in data:
+            environment = (data.get("temperature"), data.get("humidity"))
+            if environment != self._last_environment:
+                self._last_environment = environment
+                self._add_activity("env", "환경 데이터 업데이트", f"온도: {environment[0]}°C | 습도: {environment[1]}%")
+    
+    async def _poll_loop(self):
+        try:
+            while self.subscribers > 0:
+                status = await asyncio.to_thread(collect_event_status)
+                delta = {key: value for key, value in status.items() if self.status.get(key) != value}
+                if delta:
+                    self.status = status
+                    self._publish(b"data: " + json_dumps(delta) + b"\n\n")
+                await asyncio.sleep(DASHBOARD_EVENT_INTERVAL)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error("❌ 대시보드 상태 조회 오류: %s", e)
+
+dashboard_events = DashboardEvents()
+
+@app.get("/events")
+async def dashboard_event_stream():
+    """대시보드/보고서 상태 Server-Sent Events (변경된 필드와 새 활동만 전송)"""
+    
+    async def event_stream():
+        events = dashboard_events
+        events.subscribe()
+        version = events.version
+        try:
+            # 연결 직후 현재 상태와 최근 활동 전체 전송 (첫 조회 전이면 첫 변경분이 곧 전체 상태)
+            yield events.snapshot_event()
             
-                        if (timestamp) {{
-                            const date = new Date(timestamp);
-                            timestampElement.textContent = date.toLocaleTimeString();
-                            lastImageTimestamp = timestamp;
-                        }}
-                    }};
-        
-                    testImg.onerror = function() {{
-                        console.error('❌ 이미지 표시 실패');
-                    }};
-        
-                    testImg.src = imageUrl;
-        
-                }} catch (error) {{
-                    console.error('❌ 이미지 처리 오류:', error);
-                }}
-            }}
-    
-            function setupImageAutoRefresh() {{
-                if (imageRefreshInterval) {{
-                    clearInterval(imageRefreshInterval);
-                }}
-                
-                imageRefreshInterval = setInterval(async () => {{
-                    if (currentMode === 'image') {{
-                        await requestLatestImage();
-                    }}
-                }}, 3000); // 3초마다 이미지 새로고침
-            }}
-    
-            // 🔥 컨트롤 함수들
-            function captureSnapshot() {{
-                if (currentMode === 'stream') {{
-                    // 스트림에서 스냅샷 캡처
-                    const canvas = document.createElement('canvas');
-                    const img = document.getElementById('mjpegStream');
-                    canvas.width = img.naturalWidth || img.width;
-                    canvas.height = img.naturalHeight || img.height;
-                    
-                    const ctx = canvas.getContext('2d');
-                    ctx.drawImage(img, 0, 0);
-                    
-                    // 다운로드
-                    const link = document.createElement('a');
-                    link.download = `baby_monitor_snapshot_${{new Date().toISOString().slice(0,19).replace(/:/g,'-')}}.jpg`;
-                    link.href = canvas.toDataURL('image/jpeg', 0.9);
-                    link.click();
-                    
-                    console.log('📸 스냅샷 캡처 완료');
-                }} else {{
-                    // 이미지 모드에서는 현재 이미지 다운로드
-                    const img = document.getElementById('latestImage');
-                    const link = document.createElement('a');
-                    link.download = `baby_monitor_image_${{new Date().toISOString().slice(0,19).replace(/:/g,'-')}}.jpg`;
-                    link.href = img.src;
-                    link.click();
-                    
-                    console.log('📷 이미지 저장 완료');
-                }}
-            }}
-    
-            function toggleRecording() {{
-                isRecording = !isRecording;
-                const recordText = document.getElementById('recordText');
+            while True:
+                try:
+                    await asyncio.wait_for(events.changed.wait(), timeout=DASHBOARD_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+                    continue
                 
-                if (isRecording) {{
-                    recordText.textContent = '중지';
-                    console.log('🔴 녹화 시작');
-                    // 실제 녹화 로직 구현 필요
-                }} else {{
-                    recordText.textContent = '녹화';
-                    console.log('⏹️ 녹화 중지');
-                }}
-            }}
-    
-            function toggleNightMode() {{
-                // ESP32에 야간모드 명령 전송
-                fetch('/esp32/command', {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{ 
-                        command: 'night_mode', 
-                        params: {{ enable: true }} 
-                    }})
-                }})
-                .then(response => response.json())
-                .then(data => {{
-                    console.log('🌙 야간모드 토글:', data);
-                }})
-                .catch(error => {{
-                    console.error('❌ 야간모드 토글 실패:', error);
-                }});
-            }}
-    
-            function openFullscreen() {{
-                const videoContainer = document.getElementById('videoContainer');
-                if (videoContainer.requestFullscreen) {{
-                    videoContainer.requestFullscreen();
-                }} else if (videoContainer.webkitRequestFullscreen) {{
-                    videoContainer.webkitRequestFullscreen();
-                }} else if (videoContainer.msRequestFullscreen) {{
-                    videoContainer.msRequestFullscreen();
-                }}
-            }}
-    
-            // 🔥 기존 함수들
-            function playLullaby() {{
-                fetch('/esp32/command', {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{ command: 'play_lullaby', params: {{ song: 'brahms' }} }})
-                }})
-                .then(response => response.json())
-                .then(data => {{
-                    alert('🎵 자장가 재생 명령을 전송했습니다!');
-                }})
-                .catch(error => {{
-                    alert('❌ 명령 전송 실패: ' + error.message);
-                }});
-            }}
-            
-            function sendAlert() {{
-                alert('🔔 알림이 모든 연결된 앱으로 전송되었습니다!');
-            }}
+                # 그 사이 이벤트를 놓쳤다면 전체 상태로 다시 맞춤
+                yield events.last_event if events.version == version + 1 else events.snapshot_event()
+                version = events.version
+        finally:
+            events.unsubscribe()
     
-            function setupAutoRefresh() {{
-                const checkbox = document.getElementById('autoRefresh');
-        
-                if (checkbox.checked) {{
-                    autoRefreshInterval = setInterval(() => {{
-                        // 전체 페이지 새로고침은 30초마다
-                        refreshData();
-                    }}, 30000);
-                }} else {{
-                    clearInterval(autoRefreshInterval);
-                }}
-            }}
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 대시보드 HTML (값이 없는 정적 본문 - templates/dashboard.html을 서버 시작 시 한 번만 읽어 인코딩)
+# 요청마다 초기 데이터 <script> 하나만 만들어 앞/뒤 부분 사이에 넣음
+DASHBOARD_HTML = localize_vendor_assets(load_static_fragment("dashboard.html"))
+DASHBOARD_HEAD, DASHBOARD_TAIL = DASHBOARD_HTML.split(b"<!--BOOT-->")
+
+# gzip 헤더 (mtime 0, 최대 압축 플래그, OS 미지정)
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff"
+
+def deflate_segment(data: bytes, level: int = 9, final: bool = False) -> bytes:
+    """독립적으로 압축한 raw deflate 조각
+
+    sync flush로 바이트 경계에서 끝나므로 이런 조각들을 순서대로 이어 붙여도 하나의 유효한
+    deflate 스트림이 됨 (마지막 조각만 final=True)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+# 대시보드의 고정된 앞/뒤 부분은 시작 시 한 번만 압축 (요청마다는 초기 데이터 스크립트만 압축)
+DASHBOARD_HEAD_GZ = GZIP_HEADER + deflate_segment(DASHBOARD_HEAD)
+DASHBOARD_TAIL_GZ = deflate_segment(DASHBOARD_TAIL, final=True)
+DASHBOARD_HEAD_CRC = zlib.crc32(DASHBOARD_HEAD)
+DASHBOARD_SHELL_HASH = hashlib.sha1(DASHBOARD_HTML).digest()  # 배포로 페이지가 바뀌면 ETag도 바뀌도록
+
+def dashboard_etag() -> str:
+    """대시보드 약한 ETag (Redis 조회 없이 계산 - 응답 헤더를 본문보다 먼저 보내야 하므로)
     
-            // 🔥 초기화
-            document.addEventListener('DOMContentLoaded', function() {{
-                console.log('🚀 Baby Monitor 대시보드 초기화');
-                
-                // 자동 새로고침 설정
-                document.getElementById('autoRefresh').addEventListener('change', setupAutoRefresh);
-                setupAutoRefresh();
-                
-                // 기본적으로 스트림 모드로 시작
-                updateStreamStatus('loading', '연결 중...');
-                
-                // 스트림 로드 이벤트 리스너 (실제 이미지 로드 후 호출)
-                const streamImg = document.getElementById('mjpegStream');
-                streamImg.addEventListener('load', handleStreamSuccess);
-                streamImg.addEventListener('error', handleStreamError);
-                
-                // 초기 연결 상태 확인
-                setTimeout(() => {{
-                    fetch('/stream/status')
-                        .then(response => response.json())
-                        .then(data => {{
-                            console.log('📊 초기 스트림 상태:', data);
-                            if (!data.esp_eye_connected) {{
-                                console.log('⚠️ ESP Eye 연결되지 않음 - 이미지 모드로 시작');
-                                switchToImageMode();
-                            }}
-                        }})
-                        .catch(error => {{
-                            console.log('⚠️ 스트림 상태 확인 실패 - 이미지 모드로 폴백');
-                            switchToImageMode();
-                        }});
-                }}, 2000);
-            }});
-        </script>
-    </body>
-    </html>
+    /events 작업이 마지막으로 조회한 상태와 최근 활동, 분 단위 시각으로 계산 - 같은 분 안에 데이터가 그대로면 304.
+    이 값이 조금 늦더라도 페이지는 열리자마자 /events를 구독해 전체 상태를 다시 받음
     """
-    return HTMLResponse(content=html_content)
+    digest = hashlib.blake2s(DASHBOARD_SHELL_HASH, digest_size=8)
+    digest.update(json_dumps((dashboard_events.status, list(dashboard_events.activities))))
+    digest.update(get_korea_time().strftime("%Y%m%d%H%M").encode())
+    return 'W/"%s"' % digest.hexdigest()
+
+def build_dashboard_boot() -> bytes:
+    """대시보드 초기 데이터 <script> 블록 (Redis 조회 포함 - 워커 스레드에서 실행)"""
+    boot = {
+        "time": get_korea_time().strftime("%Y-%m-%d %H:%M:%S"),
+        "activities": list(dashboard_events.activities),
+        "status": collect_baby_status(),
+    }
+    # 값에 "</script>"가 들어 있어도 스크립트 블록이 끊기지 않도록 "<" 이스케이프 (색상 등 표시 결정은 브라우저 applyStatus)
+    return b"<script>window.__BOOT__=" + json_dumps(boot).replace(b"<", b"\\u003c") + b";</script>"
+
+@app.get("/dashboard", response_class=HTMLResponse)
+async def baby_monitor_dashboard(request: Request):
+    """아기 모니터링 실시간 대시보드 (MJPEG 스트리밍 통합, 상태는 /events로 갱신)"""
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    
+    # ETag는 메모리 상태로만 계산하므로 Redis 조회 전에 헤더와 앞부분을 보낼 수 있음
+    etag = dashboard_etag()
+    headers = {"Vary": "Accept-Encoding", "ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    async def generate_page():
+        # 고정된 앞부분(<head>의 CSS/JS 링크 포함)을 먼저 보내 브라우저가 파싱과 CDN 요청을 바로 시작하도록 함
+        yield DASHBOARD_HEAD_GZ if use_gzip else DASHBOARD_HEAD
+        
+        # 초기 데이터 조회는 블로킹 작업이므로 이벤트 루프 밖(스레드)에서 실행 (STATUS_CACHE_TTL 캐시를 거침)
+        boot_script = await asyncio.to_thread(build_dashboard_boot)
+        if not use_gzip:
+            yield boot_script + DASHBOARD_TAIL
+            return
+        
+        # 미리 압축한 앞/뒤 조각 사이에 초기 데이터 조각만 끼워 gzip 스트림 완성 (CRC32/길이는 전체 본문 기준)
+        crc = zlib.crc32(DASHBOARD_TAIL, zlib.crc32(boot_script, DASHBOARD_HEAD_CRC))
+        size = len(DASHBOARD_HEAD) + len(boot_script) + len(DASHBOARD_TAIL)
+        yield b"".join((
+            deflate_segment(boot_script, level=6),
+            DASHBOARD_TAIL_GZ,
+            struct.pack("<II", crc, size & 0xFFFFFFFF),
+        ))
+    
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(generate_page(), media_type="text/html", headers=headers)
+
+# 보고서 페이지의 정적인 앞부분(head/스타일)과 뒷부분(스크립트)은 import 시 한 번만 인코딩
+REPORT_HEAD = localize_vendor_assets(load_static_fragment("report_head.html"))
+REPORT_TAIL = load_static_fragment("report_tail.html")
+# 본문 템플릿도 import 시 한 번만 컴파일 (요청마다 템플릿 캐시 조회/파일 mtime 확인 없음)
+REPORT_TEMPLATE = page_templates.get_template("report.html")
+
+def gzip_html_response(request: Request, gz_body: bytes) -> Response:
+    """미리 gzip 압축된 HTML 응답 (gzip 미지원 클라이언트에는 압축 해제 후 전송)"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=gz_body,
+            media_type="text/html",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return HTMLResponse(content=gzip.decompress(gz_body), headers={"Vary": "Accept-Encoding"})
+
+# 보고서 페이지 캐시 TTL (초) - 동시 접속자들이 한 번의 렌더링 결과를 공유
+REPORT_CACHE_TTL = 5
+report_render_lock = asyncio.Lock()
+_report_cache = {"key": None, "body": None}  # 이 워커가 마지막으로 받은 보고서 (같은 키면 Redis 조회 없이 응답)
+
 @app.get("/report", response_class=HTMLResponse)
-def health_report():
-    """시스템 상태 보고서 페이지"""
+async def health_report(request: Request):
+    """시스템 상태 보고서 페이지 (짧은 TTL 캐시, gzip 사전 압축)"""
+    cache_key = (
+        f"report:{int(time.time() // REPORT_CACHE_TTL)}:"
+        f"{esp32_handler.esp32_status}:{len(websocket_manager.active_connections)}"
+    )
+    
+    # 같은 TTL 구간 안에서는 메모리의 결과를 그대로 사용 (요청마다 Redis 왕복 없음)
+    if _report_cache["key"] == cache_key:
+        return gzip_html_response(request, _report_cache["body"])
+    
+    # 캐시 미스 시 한 요청만 조회/렌더링하고 나머지는 그 결과를 사용
+    # Redis 조회와 렌더링은 블로킹 작업이므로 이벤트 루프 밖(스레드)에서 실행
+    async with report_render_lock:
+        if _report_cache["key"] != cache_key:
+            # 다른 워커가 이미 렌더링했다면 Redis 페이지 캐시에서 가져옴
+            body = await asyncio.to_thread(redis_manager.get_cached_page, cache_key) if MODULES_AVAILABLE else None
+            if body is None:
+                body = await asyncio.to_thread(build_health_report, cache_key)
+            _report_cache.update(key=cache_key, body=body)
+        body = _report_cache["body"]
+    
+    return gzip_html_response(request, body)
+
+def build_health_report(cache_key: str) -> bytes:
+    """보고서를 렌더링하고 gzip 압축해 캐시에 저장 (워커 스레드에서 실행)"""
+    # 렌더링 결과는 TTL 동안 한 번만 압축
+    body = gzip.compress(render_health_report(), compresslevel=9)
+    if MODULES_AVAILABLE:
+        redis_manager.cache_page(cache_key, body, ttl=REPORT_CACHE_TTL)
+    return body
+
+def render_health_report() -> bytes:
+    """시스템 상태 보고서 HTML 생성 (동적인 본문만 렌더링)"""
     
     # 시스템 상태 데이터 수집
     current_time = get_korea_time()
-    current_time_str = current_time.strftime("%Y년 %m월 %d일 %H:%M:%S")
+    # strftime 대신 한 번 분해한 값으로 날짜/시간 문자열을 만들어 재사용
+    year, month, day, hour, minute, second = current_time.timetuple()[:6]
+    date_str = f"{year}년 {month:02d}월 {day:02d}일"
+    time_str = f"{hour:02d}:{minute:02d}:{second:02d}"
+    timestamp_str = f"{year}-{month:02d}-{day:02d} {time_str}"
     
     # Redis 상태
     redis_status = redis_manager.available if MODULES_AVAILABLE else False
@@ -2299,9 +2150,10 @@ def health_report():
     redis_color = "success" if redis_status else "danger"
     
     # ESP32 상태
-    esp32_connected = esp32_handler.esp32_status == "connected" if hasattr(esp32_handler, 'esp32_status') else False
-    esp32_status_text = esp32_handler.esp32_status if hasattr(esp32_handler, 'esp32_status') else "unknown"
-    esp32_ip = esp32_handler.esp32_ip if hasattr(esp32_handler, 'esp32_ip') else "설정되지 않음"
+    # ESP32Handler와 DummyManager 모두 esp32_status / esp32_ip 속성을 항상 가지고 있음
+    esp32_status_text = esp32_handler.esp32_status
+    esp32_connected = esp32_status_text == "connected"
+    esp32_ip = esp32_handler.esp32_ip or "설정되지 않음"
     esp32_color = "success" if esp32_connected else "warning"
     
     # 앱 연결 상태
@@ -2314,326 +2166,105 @@ def health_report():
     
     # 최근 데이터 확인 (Redis 사용 가능한 경우)
     recent_data = None
+    image_meta = None
     last_update = "정보 없음"
-    sensor_data_html = ""
+    temperature = "N/A"
+    humidity = "N/A"
     
-    if MODULES_AVAILABLE and redis_manager.available:
+    if MODULES_AVAILABLE:
         try:
-            recent_data = redis_manager.get_current_status()
+            # 센서 데이터와 이미지 메타데이터를 한 번의 Redis 왕복으로 조회
+            bundle = redis_manager.get_report_bundle()
+            recent_data = bundle["current_esp32_data"]
+            image_meta = bundle["latest_image_meta"]
             if recent_data:
                 last_update = recent_data.get("timestamp", "알 수 없음")
                 temperature = recent_data.get("temperature", "N/A")
                 humidity = recent_data.get("humidity", "N/A")
-                
-                sensor_data_html = f"""
-                <div class="mt-3">
-                    <h6>최근 센서 데이터:</h6>
-                    <div class="row">
-                        <div class="col-6">
-                            <div class="text-center p-2 bg-light rounded">
-                                <i class="bi bi-thermometer text-danger"></i>
-                                <div><strong>{temperature}°C</strong></div>
-                                <small>온도</small>
-                            </div>
-                        </div>
-                        <div class="col-6">
-                            <div class="text-center p-2 bg-light rounded">
-                                <i class="bi bi-droplet text-primary"></i>
-                                <div><strong>{humidity}%</strong></div>
-                                <small>습도</small>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """
         except:
             pass
-
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Baby Monitor 시스템 상태 보고서</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.7.2/font/bootstrap-icons.css" rel="stylesheet">
-        <style>
-            body {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
-            .report-container {{ background: white; border-radius: 20px; box-shadow: 0 20px 40px rgba(0,0,0,0.1); }}
-            .status-card {{ border: none; border-radius: 15px; transition: transform 0.3s ease; }}
-            .status-card:hover {{ transform: translateY(-5px); }}
-            .metric-box {{ background: linear-gradient(45deg, #f8f9fa, #e9ecef); border-radius: 15px; }}
-            .header-section {{ background: linear-gradient(135deg, #667eea, #764ba2); color: white; border-radius: 20px 20px 0 0; }}
-            .status-icon {{ font-size: 2rem; }}
-            .refresh-btn {{ position: fixed; bottom: 30px; right: 30px; border-radius: 50%; width: 60px; height: 60px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container py-5">
-            <div class="report-container mx-auto" style="max-width: 1200px;">
-                
-                <!-- 헤더 섹션 -->
-                <div class="header-section p-5 text-center">
-                    <h1 class="display-4 mb-3">
-                        <i class="bi bi-heart-pulse"></i> Baby Monitor
-                    </h1>
-                    <h2 class="h3 mb-4">시스템 상태 보고서</h2>
-                    <div class="row">
-                        <div class="col-md-6">
-                            <p class="mb-1"><i class="bi bi-calendar3"></i> {current_time.strftime("%Y년 %m월 %d일")}</p>
-                            <p class="mb-0"><i class="bi bi-clock"></i> {current_time.strftime("%H:%M:%S")}</p>
-                        </div>
-                        <div class="col-md-6">
-                            <p class="mb-1"><i class="bi bi-server"></i> 서버 버전 2.0.0</p>
-                            <p class="mb-0"><i class="bi bi-geo-alt"></i> Railway Cloud</p>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- 전체 상태 요약 -->
-                <div class="p-4 bg-light">
-                    <div class="row text-center">
-                        <div class="col-md-3">
-                            <div class="metric-box p-3 h-100">
-                                <i class="bi bi-server status-icon text-primary"></i>
-                                <h4 class="mt-2">서버</h4>
-                                <span class="badge bg-success fs-6">정상 작동</span>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="metric-box p-3 h-100">
-                                <i class="bi bi-database status-icon text-{redis_color}"></i>
-                                <h4 class="mt-2">Redis</h4>
-                                <span class="badge bg-{redis_color} fs-6">{redis_info}</span>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="metric-box p-3 h-100">
-                                <i class="bi bi-router status-icon text-{esp32_color}"></i>
-                                <h4 class="mt-2">ESP32</h4>
-                                <span class="badge bg-{esp32_color} fs-6">{esp32_status_text}</span>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="metric-box p-3 h-100">
-                                <i class="bi bi-phone status-icon text-{connection_color}"></i>
-                                <h4 class="mt-2">앱 연결</h4>
-                                <span class="badge bg-{connection_color} fs-6">{active_connections}개</span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- 상세 정보 섹션 -->
-                <div class="p-5">
-                    <div class="row">
-                        
-                        <!-- 시스템 구성 요소 -->
-                        <div class="col-lg-6 mb-4">
-                            <div class="card status-card h-100">
-                                <div class="card-header bg-primary text-white">
-                                    <h5 class="mb-0"><i class="bi bi-gear"></i> 시스템 구성 요소</h5>
-                                </div>
-                                <div class="card-body">
-                                    <div class="list-group list-group-flush">
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-puzzle"></i> 고급 모듈</span>
-                                            <span class="badge bg-{modules_color}">{modules_status}</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-database"></i> Redis 캐시</span>
-                                            <span class="badge bg-{redis_color}">{redis_info}</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-wifi"></i> WebSocket</span>
-                                            <span class="badge bg-success">활성화</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-camera"></i> 이미지 처리</span>
-                                            <span class="badge bg-{modules_color}">{'활성화' if MODULES_AVAILABLE else '비활성화'}</span>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <!-- ESP32 디바이스 정보 -->
-                        <div class="col-lg-6 mb-4">
-                            <div class="card status-card h-100">
-                                <div class="card-header bg-info text-white">
-                                    <h5 class="mb-0"><i class="bi bi-router"></i> ESP32 디바이스</h5>
-                                </div>
-                                <div class="card-body">
-                                    <div class="list-group list-group-flush">
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-link"></i> 연결 상태</span>
-                                            <span class="badge bg-{esp32_color}">{esp32_status_text}</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-geo"></i> IP 주소</span>
-                                            <code>{esp32_ip}</code>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-clock-history"></i> 마지막 업데이트</span>
-                                            <small class="text-muted">{last_update}</small>
-                                        </div>
-                                    </div>
-                                    {sensor_data_html}
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <!-- 모바일 앱 연결 -->
-                        <div class="col-lg-6 mb-4">
-                            <div class="card status-card h-100">
-                                <div class="card-header bg-success text-white">
-                                    <h5 class="mb-0"><i class="bi bi-phone"></i> 모바일 앱 연결</h5>
-                                </div>
-                                <div class="card-body">
-                                    <div class="text-center mb-3">
-                                        <div class="display-4 text-{connection_color}">{active_connections}</div>
-                                        <p class="mb-0">활성 연결</p>
-                                    </div>
-                                    <div class="list-group list-group-flush">
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-broadcast"></i> WebSocket 상태</span>
-                                            <span class="badge bg-success">활성</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><i class="bi bi-arrow-repeat"></i> 실시간 업데이트</span>
-                                            <span class="badge bg-success">활성화</span>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <!-- API 엔드포인트 -->
-                        <div class="col-lg-6 mb-4">
-                            <div class="card status-card h-100">
-                                <div class="card-header bg-secondary text-white">
-                                    <h5 class="mb-0"><i class="bi bi-code"></i> API 엔드포인트</h5>
-                                </div>
-                                <div class="card-body">
-                                    <div class="list-group list-group-flush">
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><code>POST /esp32/data</code></span>
-                                            <span class="badge bg-success">활성</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><code>WebSocket /app/stream</code></span>
-                                            <span class="badge bg-success">활성</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><code>GET /status</code></span>
-                                            <span class="badge bg-success">활성</span>
-                                        </div>
-                                        <div class="list-group-item d-flex justify-content-between align-items-center">
-                                            <span><code>GET /images/latest</code></span>
-                                            <span class="badge bg-{'success' if MODULES_AVAILABLE else 'secondary'}">{'활성' if MODULES_AVAILABLE else '비활성'}</span>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <!-- 액션 버튼들 -->
-                    <div class="text-center mt-4">
-                        <a href="/test" class="btn btn-primary btn-lg me-3">
-                            <i class="bi bi-gear"></i> 테스트 페이지
-                        </a>
-                        <a href="/docs" class="btn btn-outline-primary btn-lg me-3">
-                            <i class="bi bi-book"></i> API 문서
-                        </a>
-                        <a href="/status" class="btn btn-outline-secondary btn-lg">
-                            <i class="bi bi-info-circle"></i> JSON 상태
-                        </a>
-                    </div>
-                </div>
-                
-                <!-- 푸터 -->
-                <div class="bg-light p-3 text-center" style="border-radius: 0 0 20px 20px;">
-                    <small class="text-muted">
-                        <i class="bi bi-shield-check"></i> Baby Monitor Server v2.0.0 | 
-                        마지막 업데이트: {current_time.strftime("%Y-%m-%d %H:%M:%S")}
-                    </small>
-                </div>
-            </div>
-        </div>
-        
-        <!-- 새로고침 버튼 -->
-        <button class="btn btn-primary refresh-btn" onclick="window.location.reload()">
-            <i class="bi bi-arrow-clockwise"></i>
-        </button>
-        
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-        <script>
-            // 자동 새로고침 (30초마다)
-            setTimeout(() => window.location.reload(), 30000);
-        </script>
-    </body>
-    </html>
-    """
     
-    return HTMLResponse(content=html_content)
+    last_image_time = image_meta.get("timestamp", "알 수 없음") if image_meta else "정보 없음"
+    
+    # 요약 카드: (라벨, 아이콘, 색상, 배지, 실시간 갱신 필드)
+    summary_items = [
+        ("서버", "bi-server", "success", "정상 작동", None),
+        ("Redis", "bi-database", redis_color, redis_info, "redis"),
+        ("ESP32", "bi-router", esp32_color, esp32_status_text, "esp32"),
+        ("앱 연결", "bi-phone", connection_color, f"{active_connections}개", "connections_badge"),
+    ]
+    
+    modules_text = "활성화" if MODULES_AVAILABLE else "비활성화"
+    api_color = "success" if MODULES_AVAILABLE else "secondary"
+    api_text = "활성" if MODULES_AVAILABLE else "비활성"
+    
+    # 상세 카드: 각 행은 dict(아이콘, 라벨, 값, 색상, 표시 방식, 실시간 갱신 필드)
+    cards = [
+        {
+            "title": "시스템 구성 요소", "icon": "bi-gear", "color": "primary",
+            "rows": [
+                {"icon": "bi-puzzle", "label": "고급 모듈", "value": modules_status, "color": modules_color},
+                {"icon": "bi-database", "label": "Redis 캐시", "value": redis_info, "color": redis_color, "field": "redis"},
+                {"icon": "bi-wifi", "label": "WebSocket", "value": "활성화", "color": "success"},
+                {"icon": "bi-camera", "label": "이미지 처리", "value": modules_text, "color": modules_color},
+            ],
+        },
+        {
+            "title": "ESP32 디바이스", "icon": "bi-router", "color": "info", "sensors": True,
+            "rows": [
+                {"icon": "bi-link", "label": "연결 상태", "value": esp32_status_text, "color": esp32_color, "field": "esp32"},
+                {"icon": "bi-geo", "label": "IP 주소", "value": esp32_ip, "kind": "code"},
+                {"icon": "bi-clock-history", "label": "마지막 업데이트", "value": last_update, "kind": "muted", "field": "last_update"},
+                {"icon": "bi-camera", "label": "최근 이미지", "value": last_image_time, "kind": "muted", "field": "last_image"},
+            ],
+        },
+        {
+            "title": "모바일 앱 연결", "icon": "bi-phone", "color": "success", "counter": True,
+            "rows": [
+                {"icon": "bi-broadcast", "label": "WebSocket 상태", "value": "활성", "color": "success"},
+                {"icon": "bi-arrow-repeat", "label": "실시간 업데이트", "value": "활성화", "color": "success"},
+            ],
+        },
+        {
+            "title": "API 엔드포인트", "icon": "bi-code", "color": "secondary",
+            "rows": [
+                {"code": True, "label": "POST /esp32/data", "value": "활성", "color": "success"},
+                {"code": True, "label": "WebSocket /app/stream", "value": "활성", "color": "success"},
+                {"code": True, "label": "GET /status", "value": "활성", "color": "success"},
+                {"code": True, "label": "GET /images/latest", "value": api_text, "color": api_color},
+            ],
+        },
+    ]
+    
+    body = REPORT_TEMPLATE.render(
+        date_str=date_str,
+        time_str=time_str,
+        timestamp_str=timestamp_str,
+        summary_items=summary_items,
+        cards=cards,
+        active_connections=active_connections,
+        connection_color=connection_color,
+        has_sensor_data=bool(recent_data),
+        temperature=temperature,
+        humidity=humidity,
+    )
+    return REPORT_HEAD + body.encode("utf-8") + REPORT_TAIL
 
 # 기존 초기화 코드 후에 추가
-if MODULES_AVAILABLE:
-    # ... 기존 매니저들 초기화 ...
-    
-    # 앱 API 핸들러 초기화
-    app_api_handler = AppApiHandler(
-        redis_manager=redis_manager,
-        websocket_manager=websocket_manager,
-        esp32_handler=esp32_handler,
-        image_handler=image_handler
-    )
-    
-    # 앱 API 라우터를 메인 앱에 포함
-    app.include_router(app_api_handler.get_router())
-    
-    print("📱 앱 API 핸들러 초기화 완료")
-else:
-    # 기본 모드일 때는 더미 핸들러
-    app_api_handler = None
-    print("📱 앱 API 핸들러 비활성화 (모듈 없음)")
+def find_duplicate_routes() -> List[str]:
+    """같은 (메서드, 경로)로 두 번 이상 등록된 라우트 (뒤쪽 등록은 절대 매칭되지 않음)"""
+    seen = set()
+    duplicates = []
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ("WS",):
+            key = (method, route.path)
+            if key in seen:
+                duplicates.append(f"{method} {route.path}")
+            seen.add(key)
+    return duplicates
 
-# ESP32에서 데이터가 올 때 앱들에게 브로드캐스트하는 함수 수정
-@app.post("/esp32/data")
-async def receive_esp32_data(data: Dict[str, Any]):
-    """ESP32에서 WiFi로 데이터 수신"""
-    if not MODULES_AVAILABLE:
-        return {"error": "Modules not available", "data_received": data}
-    
-    try:
-        # ESP32 핸들러로 전체 처리 위임
-        result = await esp32_handler.handle_esp32_data(data)
-        
-        # 이미지가 포함되어 있으면 별도 처리
-        if "image_base64" in data and data["image_base64"]:
-            image_result = image_handler.process_esp32_image(
-                data["image_base64"], 
-                save_to_disk=True
-            )
-            result["image_processing"] = image_result
-        
-        # 🔥 새로운 부분: 모든 연결된 앱들에게 실시간 브로드캐스트
-        if websocket_manager.active_connections:
-            broadcast_data = {
-                "type": "new_data",
-                "source": "esp32",
-                "data": data,
-                "timestamp": datetime.now().isoformat()
-            }
-            await websocket_manager.broadcast_to_apps(broadcast_data)
-        
-        return result
-        
-    except Exception as e:
-        print(f"❌ ESP32 데이터 수신 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"ESP32 data processing failed: {str(e)}")
+for duplicate in find_duplicate_routes():
+    print(f"⚠️ 중복 라우트 등록: {duplicate}")
 
 if __name__ == "__main__":
     import uvicorn
@@ -2647,4 +2278,12 @@ if __name__ == "__main__":
     print(f"🚀 서버 시작 중... 포트 {port}")
     print(f"📊 모듈 상태: {'사용 가능' if MODULES_AVAILABLE else '기본 모드'}")
     
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvloop(libuv 기반 이벤트 루프) 사용 가능 시 명시적으로 사용
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    print(f"🔁 이벤트 루프: {loop}")
+    
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=loop)
\ No newline at end of file
@@ -5,6 +5,7 @@
 from datetime import datetime, timezone, timedelta
 import asyncio
 from typing import Dict, Any
+from logging_setup import logger
 
 # 한국 시간대 설정 (안전한 버전)
 def get_korea_time():
@@ -108,7 +109,7 @@ class RealTimeHandler:
             }
             
             # 디버깅 로그
-            print(f"🕘 시간 업데이트: UTC {current_utc.strftime('%H:%M:%S')} / KST {current_kst.strftime('%H:%M:%S')}")
+            logger.debug("🕘 시간 업데이트: UTC %s / KST %s", current_utc.strftime('%H:%M:%S'), current_kst.strftime('%H:%M:%S'))
             
             # 모든 연결된 클라이언트에게 전송
             if self.websocket_manager and hasattr(self.websocket_manager, 'active_connections'):
@@ -2,15 +2,24 @@
 
 import os
 import json
+import time
 import redis
 from datetime import datetime
 from typing import Dict, Any, Optional
+from logging_setup import logger
+
+# 연결 풀 크기 - 초과 요청은 새 연결을 만들지 않고 반납될 때까지 대기 (연결 폭주 방지)
+REDIS_MAX_CONNECTIONS = 32
+REDIS_POOL_TIMEOUT = 10  # 풀에서 연결을 기다리는 최대 시간 (초)
+IMAGE_TTL = 600  # 최신 이미지 키(latest_image / image:latest_binary / image:latest_meta) TTL (초)
+IMAGE_KEYS = ("latest_image", "image:latest_binary", "image:latest_meta")
 
 class RedisManager:
     def __init__(self):
         self.redis_client = None
         self.available = False
         self.in_memory_storage = {}
+        self.page_cache = {}  # Redis 불가 시 페이지 캐시 {key: (만료 시각, body)}
         self._connect()
     
     def _connect(self):
@@ -18,26 +27,36 @@ class RedisManager:
         redis_url = os.getenv("REDIS_URL")
         
         if not redis_url:
-            print("⚠️ REDIS_URL 없음")
+            logger.warning("⚠️ REDIS_URL 없음")
             return
         
         try:
-            print(f"🔍 Redis 연결 시도...")
+            logger.info("🔍 Redis 연결 시도...")
+            
+            # 재연결 시 이전 풀의 연결은 정리
+            if self.redis_client is not None:
+                self.redis_client.connection_pool.disconnect()
             
-            # 🔥 최소한의 설정만 사용
-            self.redis_client = redis.from_url(redis_url)
+            # 🔥 최소한의 설정 + 크기가 제한된 공유 연결 풀 (요청마다 연결 생성 없음)
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_keepalive=True,
+            )
+            self.redis_client = redis.Redis(connection_pool=pool)
             
             # 연결 테스트
             result = self.redis_client.ping()
             
             if result:
                 self.available = True
-                print("✅ Redis 연결 성공!")
+                logger.info("✅ Redis 연결 성공!")
             else:
-                print("❌ Redis ping 실패")
+                logger.error("❌ Redis ping 실패")
                 
         except Exception as e:
-            print(f"❌ Redis 연결 실패: {e}")
+            logger.error("❌ Redis 연결 실패: %s", e)
             self.available = False
             self.redis_client = None
     
@@ -56,39 +75,81 @@ class RedisManager:
                 )
                 return True
             except Exception as e:
-                print(f"⚠️ Redis 저장 실패: {e}")
+                logger.warning("⚠️ Redis 저장 실패: %s", e)
                 self.available = False
         
         # 메모리 저장
         self.in_memory_storage["current_esp32_data"] = data_with_timestamp
         return True
     
-    def store_image_data(self, image_data: Dict[str, Any]) -> bool:
-        """이미지 데이터 저장"""
+    def store_image_data(self, image_data: Dict[str, Any], jpg_bytes: Optional[bytes] = None) -> bool:
+        """이미지 데이터 저장 (jpg_bytes가 있으면 디코딩된 JPEG도 함께 저장)"""
         try:
             if self.available and self.redis_client:
                 try:
-                    # Redis에 저장 (10분 TTL)
-                    result = self.redis_client.setex(
+                    # Redis에 저장 (10분 TTL) - 본문과 바이너리/메타데이터 해시를 한 번의 왕복으로 기록
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.setex(
                         "latest_image", 
-                        600,  # 10분 TTL
+                        IMAGE_TTL,
                         json.dumps(image_data, ensure_ascii=False)
                     )
-                    print(f"📦 Redis 이미지 저장: {result}")
+                    if jpg_bytes:
+                        # JPG 엔드포인트가 매번 base64를 다시 디코딩하지 않도록 원본 바이트도 보관
+                        pipe.setex("image:latest_binary", IMAGE_TTL, jpg_bytes)
+                        pipe.delete("image:latest_meta")
+                        pipe.hset("image:latest_meta", mapping=self._binary_meta(image_data, jpg_bytes))
+                        pipe.expire("image:latest_meta", IMAGE_TTL)
+                    result = pipe.execute()[0]
+                    logger.debug("📦 Redis 이미지 저장: %s", result)
                     return bool(result)
                 except Exception as e:
-                    print(f"⚠️ Redis 이미지 저장 실패: {e}")
+                    logger.warning("⚠️ Redis 이미지 저장 실패: %s", e)
                     self.available = False
         
             # 메모리 저장 (fallback)
             self.in_memory_storage["latest_image"] = image_data
-            print(f"📦 메모리에 이미지 저장: {len(image_data.get('image_base64', ''))} bytes")
+            if jpg_bytes:
+                self.in_memory_storage["latest_image_binary"] = (jpg_bytes, self._binary_meta(image_data, jpg_bytes))
+            logger.debug("📦 메모리에 이미지 저장: %d bytes", len(image_data.get('image_base64', '')))
             return True
         
         except Exception as e:
-            print(f"❌ 이미지 저장 총 오류: {e}")
+            logger.error("❌ 이미지 저장 총 오류: %s", e)
             return False
 
+    def refresh_image_ttl(self) -> bool:
+        """같은 이미지가 계속 들어올 때 저장 없이 최신 이미지 키들의 TTL만 연장 (한 번의 왕복)"""
+        if not (self.available and self.redis_client):
+            return False  # 메모리 저장은 만료가 없음
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in IMAGE_KEYS:
+                pipe.expire(key, IMAGE_TTL)
+            return any(pipe.execute())
+        except Exception as e:
+            logger.warning("⚠️ Redis 이미지 TTL 연장 실패: %s", e)
+            self.available = False
+            return False
+
+    @staticmethod
+    def _decode_meta(metadata: Dict[Any, Any]) -> Dict[str, str]:
+        """Redis 해시(bytes 키/값)를 문자열 dict로 변환"""
+        return {
+            (key.decode('utf-8') if isinstance(key, bytes) else key):
+            (value.decode('utf-8') if isinstance(value, bytes) else value)
+            for key, value in metadata.items()
+        }
+
+    @staticmethod
+    def _binary_meta(image_data: Dict[str, Any], jpg_bytes: bytes) -> Dict[str, str]:
+        """바이너리 이미지용 메타데이터 (Redis 해시 저장용 문자열 값)"""
+        return {
+            "timestamp": str(image_data.get("timestamp", "")),
+            "binary_size": str(len(jpg_bytes)),
+            "format": "jpeg"
+        }
+
     def get_latest_image(self) -> Optional[Dict[str, Any]]:
         """최신 이미지 조회"""
         try:
@@ -98,55 +159,65 @@ class RedisManager:
                     data = self.redis_client.get("latest_image")
                     if data:
                         result = json.loads(data)
-                        print(f"📦 Redis에서 이미지 조회: {len(result.get('image_base64', ''))} bytes")
+                        logger.debug("📦 Redis에서 이미지 조회: %d bytes", len(result.get('image_base64', '')))
                         return result
                 except Exception as e:
-                    print(f"⚠️ Redis 이미지 조회 실패: {e}")
+                    logger.warning("⚠️ Redis 이미지 조회 실패: %s", e)
                     self.available = False
         
             # 메모리 조회 (fallback)
             result = self.in_memory_storage.get("latest_image")
             if result:
-                print(f"📦 메모리에서 이미지 조회: {len(result.get('image_base64', ''))} bytes")
+                logger.debug("📦 메모리에서 이미지 조회: %d bytes", len(result.get('image_base64', '')))
             else:
-                print("📦 저장된 이미지 없음")
+                logger.debug("📦 저장된 이미지 없음")
             return result
         
         except Exception as e:
-            print(f"❌ 이미지 조회 총 오류: {e}")
+            logger.error("❌ 이미지 조회 총 오류: %s", e)
             return None
 
-    def get_latest_image_binary(self):
+    def get_latest_image_meta(self) -> Optional[Dict[str, Any]]:
+        """최신 이미지 메타데이터만 조회 (image:latest_meta 해시 - base64 본문 없이 변경 여부 확인용)"""
         try:
-            if not self.available:
-                return None, None
+            if self.available and self.redis_client:
+                try:
+                    metadata = self.redis_client.hgetall("image:latest_meta")
+                    if metadata:
+                        return self._decode_meta(metadata)
+                except Exception as e:
+                    logger.warning("⚠️ Redis 이미지 메타데이터 조회 실패: %s", e)
+                    self.available = False
+            
+            return self.in_memory_storage.get("latest_image_binary", (None, None))[1]
         
-            # 바이너리 데이터 조회
-            jpg_binary = self.redis.get("image:latest_binary")
+        except Exception as e:
+            logger.error("❌ 이미지 메타데이터 조회 오류: %s", e)
+            return None
+
+    def get_latest_image_binary(self):
+        try:
+            if not (self.available and self.redis_client):
+                # 메모리 조회 (fallback)
+                return self.in_memory_storage.get("latest_image_binary", (None, None))
         
-            # 메타데이터 조회
-            metadata = self.redis.hgetall("image:latest_meta")
+            # 바이너리 데이터와 메타데이터를 한 번의 왕복으로 조회
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get("image:latest_binary")
+            pipe.hgetall("image:latest_meta")
+            jpg_binary, metadata = pipe.execute()
         
             if jpg_binary and metadata:
                 # bytes 타입 확인
                 if isinstance(jpg_binary, str):
                     jpg_binary = jpg_binary.encode('latin-1')
             
-                # 메타데이터 타입 변환
-                meta_dict = {}
-                for key, value in metadata.items():
-                    if isinstance(key, bytes):
-                        key = key.decode('utf-8')
-                    if isinstance(value, bytes):
-                        value = value.decode('utf-8')
-                    meta_dict[key] = value
-            
-                return jpg_binary, meta_dict
+                return jpg_binary, self._decode_meta(metadata)
         
             return None, None
         
         except Exception as e:
-            print(f"❌ Redis 바이너리 이미지 조회 실패: {e}")
+            logger.error("❌ Redis 바이너리 이미지 조회 실패: %s", e)
             return None, None
 
     def get_image_by_id(self, image_id):
@@ -164,7 +235,7 @@ class RedisManager:
             return None
         
         except Exception as e:
-            print(f"❌ Redis 이미지 ID 조회 실패: {e}")
+            logger.error("❌ Redis 이미지 ID 조회 실패: %s", e)
             return None
     
     def get_current_status(self) -> Optional[Dict[str, Any]]:
@@ -177,16 +248,70 @@ class RedisManager:
                     if data:
                         return json.loads(data)
                 except Exception as e:
-                    print(f"⚠️ Redis 조회 실패: {e}")
+                    logger.warning("⚠️ Redis 조회 실패: %s", e)
                     self.available = False
         
             # 메모리 조회
             return self.in_memory_storage.get("current_esp32_data")
         
         except Exception as e:
-            print(f"❌ 상태 조회 총 오류: {e}")
+            logger.error("❌ 상태 조회 총 오류: %s", e)
             return None
     
+    def get_report_bundle(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """보고서 페이지용 데이터를 한 번의 왕복으로 조회 (센서 데이터 + 이미지 메타데이터 해시)"""
+        # Redis 시도
+        if self.available and self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get("current_esp32_data")
+                pipe.hgetall("image:latest_meta")
+                current_data, image_meta = pipe.execute()
+                return {
+                    "current_esp32_data": json.loads(current_data) if current_data else None,
+                    "latest_image_meta": self._decode_meta(image_meta) if image_meta else None,
+                }
+            except Exception as e:
+                logger.warning("⚠️ Redis 보고서 데이터 조회 실패: %s", e)
+                self.available = False
+        
+        # 메모리 조회
+        return {
+            "current_esp32_data": self.in_memory_storage.get("current_esp32_data"),
+            "latest_image_meta": self.in_memory_storage.get("latest_image_binary", (None, None))[1],
+        }
+    
+    def get_cached_page(self, key: str) -> Optional[bytes]:
+        """렌더링된 페이지 캐시 조회"""
+        if self.available and self.redis_client:
+            try:
+                return self.redis_client.get(f"page_cache:{key}")
+            except Exception as e:
+                logger.warning("⚠️ Redis 페이지 캐시 조회 실패: %s", e)
+                self.available = False
+        
+        entry = self.page_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def cache_page(self, key: str, body: bytes, ttl: int = 5) -> bool:
+        """렌더링된 페이지를 짧은 TTL로 캐시"""
+        if self.available and self.redis_client:
+            try:
+                self.redis_client.setex(f"page_cache:{key}", ttl, body)
+                return True
+            except Exception as e:
+                logger.warning("⚠️ Redis 페이지 캐시 저장 실패: %s", e)
+                self.available = False
+        
+        # 메모리 캐시 (만료된 항목 정리 후 저장)
+        now = time.monotonic()
+        for expired_key in [k for k, (expires, _) in self.page_cache.items() if expires <= now]:
+            del self.page_cache[expired_key]
+        self.page_cache[key] = (now + ttl, body)
+        return True
+    
     def reconnect(self):
         """재연결 시도"""
         self._connect()
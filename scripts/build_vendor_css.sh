@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+# static/vendor/의 Bootstrap / Bootstrap Icons CSS에서 페이지가 실제로 쓰는 규칙만 남긴 빌드 생성
+#
+#   npm install --no-save bootstrap@5.1.3 bootstrap-icons@1.7.2 purgecss
+#   ./scripts/build_vendor_css.sh
+#
+# 결과: static/vendor/bootstrap-5.1.3.purged.css, static/vendor/bootstrap-icons-1.7.2.purged.css
+# (있으면 main.py의 VENDOR_ASSETS가 전체 CSS 대신 사용). 템플릿을 바꾸면 다시 실행하세요.
+set -euo pipefail
+cd "$(dirname "$0")/.."
+
+NODE_MODULES=${NODE_MODULES:-node_modules}
+OUT=static/vendor
+# 페이지 HTML: templates/ + main.py 안의 인라인 페이지 (설정 가이드, /test 등)
+CONTENT=(templates/*.html main.py)
+# JS가 문자열 조합으로 만드는 클래스 (`text-${color}`, `bi-${...}`)와 Bootstrap JS가 붙이는 상태 클래스
+SAFELIST=(
+    '/^(text|bg|border|btn|alert|badge)-(success|warning|danger|info|secondary|primary)$/'
+    '/^bi-(person-check|person-x|check-circle|exclamation-triangle|info-circle)$/'
+    '/^(show|fade|collapsing|active|disabled)$/'
+)
+
+mkdir -p "$OUT"
+
+npx purgecss \
+    --css "$NODE_MODULES/bootstrap/dist/css/bootstrap.min.css" \
+    --content "${CONTENT[@]}" \
+    --safelist "${SAFELIST[@]}" \
+    --output "$OUT/bootstrap-5.1.3.purged.css"
+
+# 아이콘 CSS도 사용하는 bi-* 규칙만 남김 (글꼴 파일은 그대로 fonts/ 사용)
+npx purgecss \
+    --css "$NODE_MODULES/bootstrap-icons/font/bootstrap-icons.css" \
+    --content "${CONTENT[@]}" \
+    --safelist "${SAFELIST[@]}" \
+    --output "$OUT/bootstrap-icons-1.7.2.purged.css"
+
+ls -l "$OUT"/*.purged.css
@@ -0,0 +1,39 @@
+"""
+/app/images/latest.jpg 응답 확인 (Redis에 저장된 JPEG 바이트를 그대로 반환하는지)
+실행: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app_api_handler import AppApiHandler
+
+JPEG_BYTES = b"\xff\xd8\xff\xe0" + b"\x00" * 32 + b"\xff\xd9"
+
+
+class FakeRedisManager:
+    """get_latest_image_binary만 제공하는 Redis 대역"""
+    
+    def get_recent_images(self, count):
+        return []
+    
+    def get_latest_image_binary(self):
+        return JPEG_BYTES, {"timestamp": "2024-01-01T00:00:00", "binary_size": str(len(JPEG_BYTES)), "format": "jpeg"}
+
+
+class LatestImageJpgTest(unittest.TestCase):
+    def test_returns_stored_jpeg(self):
+        handler = AppApiHandler(FakeRedisManager(), None, None, None)
+        response = handler.get_latest_image_jpg()
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.media_type, "image/jpeg")
+        self.assertEqual(response.body, JPEG_BYTES)
+        self.assertEqual(response.headers["content-length"], str(len(JPEG_BYTES)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,64 @@
 import asyncio
 import json
+import os
 from fastapi import WebSocket
-from typing import List, Dict, Any
+from fastapi.websockets import WebSocketState
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import time
+from logging_setup import logger
+
+# JSON 직렬화 (orjson 사용 가능 시 우선 사용)
+try:
+    import orjson
+
+    def dumps_text(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _json_default(obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return str(obj)
+
+    def dumps_text(data: Any) -> str:
+        return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+# 버스트로 들어오는 ESP32 샘플을 한 프레임으로 묶는 대기 시간 (초)
+BROADCAST_BATCH_WINDOW = 0.02
+# 배치 큐 상한 - 전송이 밀리면 가장 오래된 메시지(base64 프레임 포함)부터 버림
+BROADCAST_QUEUE_MAXSIZE = 32
+
+# 동시 WebSocket 연결 상한 및 끊긴 연결 정리 주기 (초)
+# 응답 없는 연결 감지는 uvicorn의 프로토콜 ping/pong(기본 20초 간격, 20초 응답 제한)이 담당 - 앱 메시지를 보내지 않음
+MAX_CONNECTIONS = int(os.getenv("MAX_WS_CONNECTIONS", "500"))
+REAPER_INTERVAL = 30
+REAPER_CLOSE_TIMEOUT = 2
 
 class WebSocketManager:
     def __init__(self):
         # 연결 관리를 Dict 기반으로 통일
         self.active_connections: Dict[str, Dict[str, Any]] = {}
         self.connection_counter = 0
+        
+        # 앱 브로드캐스트 배치 큐 (이벤트 루프 안에서 처음 사용할 때 생성)
+        self._broadcast_queue: asyncio.Queue = None
+        self._broadcast_task: asyncio.Task = None
+        
+        # 끊긴 연결 정리 작업 (첫 연결 시 시작)
+        self._reaper_task: asyncio.Task = None
     
-    async def connect(self, websocket: WebSocket, client_type: str = "unknown", client_info: Dict[str, Any] = None) -> str:
-        """WebSocket 연결"""
+    async def connect(self, websocket: WebSocket, client_type: str = "unknown", client_info: Dict[str, Any] = None) -> Optional[str]:
+        """WebSocket 연결 (상한 초과 시 1013으로 닫고 None 반환)"""
         await websocket.accept()
         
+        if len(self.active_connections) >= MAX_CONNECTIONS:
+            logger.warning("⚠️ WebSocket 연결 상한 초과 (%d) - %s 연결 거부", MAX_CONNECTIONS, client_type)
+            await websocket.close(code=1013)  # Try Again Later
+            return None
+        
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+        
         # 고유한 클라이언트 ID 생성
         self.connection_counter += 1
         client_id = f"{client_type}_{int(time.time())}_{self.connection_counter}"
@@ -29,7 +73,7 @@ class WebSocketManager:
             "message_count": 0
         }
         
-        print(f"📱 {client_type} 연결됨 ({client_id}). 총 연결: {len(self.active_connections)}")
+        logger.info("📱 %s 연결됨 (%s). 총 연결: %d", client_type, client_id, len(self.active_connections))
         
         # 연결 즉시 환영 메시지
         await self.send_to_connection(client_id, {
@@ -48,7 +92,7 @@ class WebSocketManager:
             client_info = self.active_connections[client_id]
             client_type = client_info.get("client_type", "unknown")
             del self.active_connections[client_id]
-            print(f"📱 {client_type} 연결 해제 ({client_id}). 남은 연결: {len(self.active_connections)}")
+            logger.info("📱 %s 연결 해제 (%s). 남은 연결: %d", client_type, client_id, len(self.active_connections))
     
     async def send_to_connection(self, client_id: str, data: Dict[str, Any]):
         """특정 연결에 메시지 전송"""
@@ -66,44 +110,66 @@ class WebSocketManager:
             return True
                 
         except Exception as e:
-            print(f"❌ WebSocket 전송 실패 ({client_id}): {e}")
+            logger.error("❌ WebSocket 전송 실패 (%s): %s", client_id, e)
             self.disconnect(client_id)
             return False
     
-    async def broadcast_to_all(self, data: Dict[str, Any]) -> int:
-        """모든 연결에 브로드캐스트"""
+    async def broadcast_raw(self, payload: str, client_type: str = None) -> int:
+        """미리 직렬화된 메시지를 그대로 전송 (client_type 지정 시 해당 타입만)"""
         if not self.active_connections:
             return 0
         
-        # 타임스탬프 추가
-        message_data = {
-            **data,
-            "broadcast_timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        # 대상 연결 스냅샷 (전송 중 연결/해제가 일어나도 안전)
+        targets = [
+            (client_id, client_info)
+            for client_id, client_info in self.active_connections.items()
+            if not client_type or client_info.get("client_type") == client_type
+        ]
+        if not targets:
+            return 0
+        
+        # 느린 클라이언트가 다른 클라이언트 전송을 막지 않도록 동시에 전송
+        results = await asyncio.gather(
+            *(client_info["websocket"].send_text(payload) for _, client_info in targets),
+            return_exceptions=True
+        )
         
         disconnected = []
         sent_count = 0
+        now_iso = datetime.now(timezone.utc).isoformat()
         
-        for client_id, client_info in self.active_connections.items():
-            try:
-                websocket = client_info["websocket"]
-                await websocket.send_json(message_data)
-                
-                # 메시지 카운트 및 활동 시간 업데이트
-                client_info["message_count"] += 1
-                client_info["last_seen"] = datetime.now(timezone.utc).isoformat()
-                sent_count += 1
-                    
-            except Exception as e:
-                print(f"❌ 브로드캐스트 실패 ({client_id}): {e}")
+        for (client_id, client_info), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning("❌ 브로드캐스트 실패 (%s): %s", client_id, result)
                 disconnected.append(client_id)
+                continue
+            
+            # 메시지 카운트 및 활동 시간 업데이트
+            client_info["message_count"] += 1
+            client_info["last_seen"] = now_iso
+            sent_count += 1
         
         # 끊어진 연결 제거
         for client_id in disconnected:
             self.disconnect(client_id)
         
+        return sent_count
+    
+    async def broadcast_to_all(self, data: Dict[str, Any]) -> int:
+        """모든 연결에 브로드캐스트"""
+        if not self.active_connections:
+            return 0
+        
+        # 타임스탬프 추가 (직렬화는 한 번만)
+        payload = dumps_text({
+            **data,
+            "broadcast_timestamp": datetime.now(timezone.utc)
+        })
+        
+        sent_count = await self.broadcast_raw(payload)
+        
         if sent_count > 0:
-            print(f"📡 {sent_count}개 클라이언트에 데이터 전송")
+            logger.debug("📡 %d개 클라이언트에 데이터 전송", sent_count)
         
         return sent_count
     
@@ -112,48 +178,99 @@ class WebSocketManager:
         if not self.active_connections:
             return 0
         
-        # 앱 클라이언트들 필터링
-        app_clients = {
-            client_id: client_info 
-            for client_id, client_info in self.active_connections.items()
-            if client_info.get("client_type") == "mobile_app"
-        }
-        
-        if not app_clients:
-            return 0
-        
-        # 메시지에 타입과 타임스탬프 추가
-        message_data = {
+        # 메시지에 타입과 타임스탬프 추가 (직렬화는 한 번만)
+        payload = dumps_text({
             "type": "esp32_data",
             **data,
-            "app_broadcast_timestamp": datetime.now(timezone.utc).isoformat()
-        }
+            "app_broadcast_timestamp": datetime.now(timezone.utc)
+        })
         
-        disconnected = []
-        sent_count = 0
+        sent_count = await self.broadcast_raw(payload, client_type="mobile_app")
+        
+        if sent_count > 0:
+            logger.debug("📱 %d개 앱에 ESP32 데이터 전송", sent_count)
         
-        for client_id, client_info in app_clients.items():
-            try:
-                websocket = client_info["websocket"]
-                await websocket.send_json(message_data)
+        return sent_count
+    
+    def queue_app_broadcast(self, data: Dict[str, Any]):
+        """앱 브로드캐스트를 배치 큐에 추가 (짧은 시간 내 메시지는 한 프레임으로 묶음)"""
+        if self._broadcast_queue is None:
+            self._broadcast_queue = asyncio.Queue(maxsize=BROADCAST_QUEUE_MAXSIZE)
+        if self._broadcast_task is None or self._broadcast_task.done():
+            self._broadcast_task = asyncio.create_task(self._broadcast_worker())
+        try:
+            self._broadcast_queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # 느린 앱 소켓 때문에 전송이 밀린 경우 - 오래된 데이터보다 최신 데이터가 중요하므로 가장 오래된 것을 버림
+            self._broadcast_queue.get_nowait()
+            self._broadcast_queue.put_nowait(data)
+    
+    async def _broadcast_worker(self):
+        """배치 큐를 비우며 앱들에게 브로드캐스트"""
+        queue = self._broadcast_queue
+        try:
+            while True:
+                batch = [await queue.get()]
                 
-                # 메시지 카운트 및 활동 시간 업데이트
-                client_info["message_count"] += 1
-                client_info["last_seen"] = datetime.now(timezone.utc).isoformat()
-                sent_count += 1
-                    
-            except Exception as e:
-                print(f"❌ 앱 브로드캐스트 실패 ({client_id}): {e}")
-                disconnected.append(client_id)
+                # 버스트가 모일 시간을 준 뒤 쌓인 메시지를 한 번에 가져옴
+                await asyncio.sleep(BROADCAST_BATCH_WINDOW)
+                try:
+                    while True:
+                        batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    pass
+                
+                # 단건은 기존 메시지 형식 그대로 전송 (앱 호환성)
+                if len(batch) == 1:
+                    message = batch[0]
+                else:
+                    message = {"type": "batch", "count": len(batch), "items": batch}
+                
+                try:
+                    await self.broadcast_to_apps(message)
+                except Exception as e:
+                    logger.error("❌ 배치 브로드캐스트 오류: %s", e)
+        except asyncio.CancelledError:
+            logger.info("📡 배치 브로드캐스트 작업 종료")
+    
+    def stop_broadcast_worker(self):
+        """배치 브로드캐스트 작업 중지"""
+        if self._broadcast_task and not self._broadcast_task.done():
+            self._broadcast_task.cancel()
+        if self._reaper_task and not self._reaper_task.done():
+            self._reaper_task.cancel()
+    
+    async def _reaper_loop(self):
+        """주기적으로 끊긴 연결을 찾아 정리"""
+        try:
+            while True:
+                await asyncio.sleep(REAPER_INTERVAL)
+                await self.reap_stale_connections()
+        except asyncio.CancelledError:
+            logger.info("🧹 연결 정리 작업 종료")
+    
+    async def reap_stale_connections(self) -> int:
+        """이미 닫힌 연결 제거 (ping 응답이 없는 연결은 uvicorn이 끊으므로 여기서는 상태만 확인)"""
+        stale = [
+            (client_id, client_info["websocket"])
+            for client_id, client_info in list(self.active_connections.items())
+            if client_info["websocket"].client_state != WebSocketState.CONNECTED
+            or client_info["websocket"].application_state != WebSocketState.CONNECTED
+        ]
+        if not stale:
+            return 0
         
-        # 끊어진 연결 제거
-        for client_id in disconnected:
+        for client_id, _ in stale:
             self.disconnect(client_id)
         
-        if sent_count > 0:
-            print(f"📱 {sent_count}개 앱에 ESP32 데이터 전송")
+        # 닫기도 한 연결이 다른 연결을 기다리게 하지 않도록 동시에, 시간 제한을 두고 실행
+        await asyncio.gather(
+            *(asyncio.wait_for(websocket.close(), REAPER_CLOSE_TIMEOUT) for _, websocket in stale),
+            return_exceptions=True
+        )
         
-        return sent_count
+        logger.info("🧹 끊긴 WebSocket 연결 %d개 정리", len(stale))
+        return len(stale)
     
     async def handle_app_message(self, client_id: str, message: str, esp32_handler=None):
         """앱에서 온 메시지 처리 (자장가 제어 포함)"""
@@ -161,14 +278,14 @@ class WebSocketManager:
             data = json.loads(message)
             message_type = data.get("type")
             
-            print(f"📱 앱 메시지 수신 ({client_id}): {message_type}")
+            logger.debug("📱 앱 메시지 수신 (%s): %s", client_id, message_type)
             
             if message_type == "command":
                 # ESP32에 명령 전달
                 command_name = data.get("command")
                 params = data.get("params", {})
                 
-                print(f"🎵 앱 명령: {command_name}, 파라미터: {params}")
+                logger.debug("🎵 앱 명령: %s, 파라미터: %s", command_name, params)
                 
                 if esp32_handler:
                     # ESP32로 전송할 명령 구성
@@ -192,7 +309,7 @@ class WebSocketManager:
                             "volume": volume
                         }
                         
-                        print(f"🎵 자장가 제어: {'켜기' if enabled else '끄기'} (곡: {song}, 볼륨: {volume})")
+                        logger.info("🎵 자장가 제어: %s (곡: %s, 볼륨: %s)", '켜기' if enabled else '끄기', song, volume)
                     
                     # ESP32로 명령 전송
                     success = await esp32_handler.send_command_to_esp32(esp32_command)